@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field
+from typing import List
+import numpy as np
+from app.agents.skill_extractor import extract_skills
+from app.services.embedding_service import embedding_service
+from app.services.cache_service import content_hash, job_cache
+
+@dataclass
+class JobProfile:
+    """Job-description analysis shared by every resume ranked against it."""
+    jd_hash: str
+    job_description: str
+    required_skills: List[str] = field(default_factory=list)
+    # float32 vectors, shared (not copied) by every candidate's graph state
+    jd_embedding: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))
+    # One row per required skill, used to retrieve matching resume chunks
+    requirement_embeddings: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.float32))
+
+    @property
+    def queries(self) -> np.ndarray:
+        """Retrieval queries: the requirement embeddings, or the JD embedding if there are none."""
+        if len(self.requirement_embeddings):
+            return self.requirement_embeddings
+        return self.jd_embedding[None, :]
+
+def get_jd_embedding(job_description: str) -> List[float]:
+    """Embed a job description, cached by the JD hash."""
+    jd_hash = content_hash(job_description.encode("utf-8"))
+    jd_embedding = job_cache.get(jd_hash, "embedding")
+    if jd_embedding is None:
+        jd_embedding = embedding_service.embed_query(job_description)
+        job_cache.set(jd_hash, "embedding", jd_embedding)
+    return jd_embedding
+
+def get_required_skills(job_description: str) -> List[str]:
+    """Extract the JD's required skills, cached by the JD hash."""
+    jd_hash = content_hash(job_description.encode("utf-8"))
+    required_skills = job_cache.get(jd_hash, "skills")
+    if required_skills is None:
+        required_skills = extract_skills(job_description, "jd")
+        job_cache.set(jd_hash, "skills", required_skills)
+    return required_skills
+
+def get_requirement_embeddings(job_description: str, required_skills: List[str]) -> List[List[float]]:
+    """Embed each required skill of a JD in one batch, cached by the JD hash."""
+    if not required_skills:
+        return []
+    jd_hash = content_hash(job_description.encode("utf-8"))
+    requirement_embeddings = job_cache.get(jd_hash, "requirement_embeddings")
+    if requirement_embeddings is None or len(requirement_embeddings) != len(required_skills):
+        requirement_embeddings = embedding_service.embed_batch(required_skills)
+        job_cache.set(jd_hash, "requirement_embeddings", requirement_embeddings)
+    return requirement_embeddings
+
+def build_job_profile(job_description: str) -> JobProfile:
+    """Extract required skills and embed the JD, cached by the JD hash."""
+    required_skills = get_required_skills(job_description)
+    jd_embedding = np.asarray(get_jd_embedding(job_description), dtype=np.float32)
+    requirement_embeddings = np.asarray(
+        get_requirement_embeddings(job_description, required_skills), dtype=np.float32
+    ).reshape(-1, len(jd_embedding))
+    return JobProfile(
+        jd_hash=content_hash(job_description.encode("utf-8")),
+        job_description=job_description,
+        required_skills=required_skills,
+        jd_embedding=jd_embedding,
+        requirement_embeddings=requirement_embeddings
+    )
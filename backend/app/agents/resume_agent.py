@@ -1,61 +1,109 @@
+from typing import AsyncIterator
 from langgraph.graph import StateGraph, END
 from app.core.state import AgentState
 from app.agents.skill_extractor import extract_skills
-from app.agents.trust_score import calculate_similarity, calculate_trust_score
-from app.services.embedding_service import embedding_service
+from app.agents.job_profile import get_jd_embedding, get_required_skills
+from app.agents.trust_score import calculate_trust_score
+from app.agents.skill_matcher import compare_skills
+from app.agents.retrieval import get_resume_chunks, score_candidates
+from app.services.chunking import skill_context
+from app.services.cache_service import resume_cache
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from app.core.config import settings
+from app.utils.metrics import instrument_node, llm_metrics
 
 llm = ChatGoogleGenerativeAI(
     model=settings.LLM_MODEL,
     temperature=0.7,
-    google_api_key=settings.GOOGLE_API_KEY
+    google_api_key=settings.GOOGLE_API_KEY,
+    base_url=settings.GEMINI_BASE_URL or None,
+    callbacks=[llm_metrics]
 )
 
-def create_resume_agent():
+def _feedback_chain():
+    prompt = ChatPromptTemplate.from_template(
+        "As a professional career coach, analyze this resume against the job description. "
+        "Provide specific improvement suggestions. Focus on missing skills: {missing_skills}. "
+        "Match similarity score: {score}/10\n\n"
+        "Relevant Resume Excerpts: {resume}\n\nJob Description: {jd}"
+    )
+    return prompt | llm | StrOutputParser()
+
+def _feedback_inputs(state: AgentState) -> dict:
+    return {
+        "missing_skills": ", ".join(state.missing_skills),
+        "score": round(state.similarity_score * 10, 2),
+        "resume": "\n...\n".join(state.relevant_chunks) or state.resume_text[:2000],
+        "jd": state.job_description[:2000]
+    }
+
+def generate_feedback(state: AgentState) -> str:
+    """Generate the career-coach feedback report for a scored resume."""
+    return _feedback_chain().invoke(_feedback_inputs(state))
+
+async def stream_feedback(state: AgentState) -> AsyncIterator[str]:
+    """Yield the feedback report for a scored resume token by token."""
+    async for chunk in _feedback_chain().astream(_feedback_inputs(state)):
+        yield chunk
+
+def create_resume_agent(include_feedback: bool = True):
+    """Compile the screening graph.
+
+    extract_skills, process_jd and calculate_similarity run in parallel and
+    join at find_missing_skills; calculate_trust_score runs before
+    generate_feedback. With include_feedback=False (ranking mode) the graph
+    ends at calculate_trust_score and never calls the feedback LLM.
+    """
     # Define nodes with proper state updates
     def extract_text_node(state: AgentState):
-        # No change needed - just passing through
-        return state
+        # No change needed - an empty update avoids writing back the whole state
+        return {}
 
     def extract_skills_node(state: AgentState):
-        state.extracted_skills = extract_skills(state.resume_text, "resume")
+        # Ranking seeds the skills from the combined resume analysis
+        if state.extracted_skills:
+            return {}
+        cached = resume_cache.get(state.resume_hash, "skills") if state.resume_hash else None
+        if cached is not None:
+            state.extracted_skills = cached
+        else:
+            # Only the skill-bearing sections are sent to the LLM
+            state.extracted_skills = extract_skills(skill_context(state.resume_text), "resume")
+            if state.resume_hash:
+                resume_cache.set(state.resume_hash, "skills", state.extracted_skills)
         return {"extracted_skills": state.extracted_skills}
 
     def process_jd_node(state: AgentState):
-        state.required_skills = extract_skills(state.job_description, "jd")
+        # Callers normally seed the state from a precomputed JobProfile;
+        # only analyse the JD here when they did not.
+        if state.jd_embedding is not None:
+            return {}
+        state.required_skills = get_required_skills(state.job_description)
         return {"required_skills": state.required_skills}
 
     def calculate_similarity_node(state: AgentState):
-        state.resume_embedding = embedding_service.embed_query(state.resume_text)
-        state.jd_embedding = embedding_service.embed_query(state.job_description)
-        state.similarity_score = calculate_similarity(
-            state.resume_embedding, 
-            state.jd_embedding
-        )
-        return {"similarity_score": state.similarity_score}
+        # Batch callers retrieve and score every resume up front
+        if state.similarity_scored:
+            return {}
+        chunks, chunk_embeddings = get_resume_chunks(state.resume_hash, state.resume_text)
+        queries = state.requirement_embeddings
+        if queries is None or len(queries) == 0:
+            jd_embedding = state.jd_embedding
+            if jd_embedding is None:
+                jd_embedding = get_jd_embedding(state.job_description)
+            queries = [jd_embedding]
+        state.similarity_score, best_chunks = score_candidates([chunk_embeddings], queries)[0]
+        state.relevant_chunks = [chunks[i] for i in best_chunks]
+        return {"similarity_score": state.similarity_score, "relevant_chunks": state.relevant_chunks}
 
     def find_missing_skills_node(state: AgentState):
-        state.missing_skills = list(set(state.required_skills) - set(state.extracted_skills))
+        state.missing_skills = compare_skills(state.required_skills, state.extracted_skills).missing
         return {"missing_skills": state.missing_skills}
 
     def generate_feedback_node(state: AgentState):
-        prompt = ChatPromptTemplate.from_template(
-            "As a professional career coach, analyze this resume against the job description. "
-            "Provide specific improvement suggestions. Focus on missing skills: {missing_skills}. "
-            "Match similarity score: {score}/10\n\n"
-            "Resume Summary: {resume}\n\nJob Description: {jd}"
-        )
-        
-        chain = prompt | llm | StrOutputParser()
-        state.feedback_report = chain.invoke({
-            "missing_skills": ", ".join(state.missing_skills),
-            "score": round(state.similarity_score * 10, 2),
-            "resume": state.resume_text[:2000],
-            "jd": state.job_description[:2000]
-        })
+        state.feedback_report = generate_feedback(state)
         return {"feedback_report": state.feedback_report}
 
     def calculate_trust_score_node(state: AgentState):
@@ -65,22 +113,31 @@ def create_resume_agent():
     # Build workflow with proper state merging
     workflow = StateGraph(AgentState)
 
-    workflow.add_node("extract_text", extract_text_node)
-    workflow.add_node("extract_skills", extract_skills_node)
-    workflow.add_node("process_jd", process_jd_node)
-    workflow.add_node("calculate_similarity", calculate_similarity_node)
-    workflow.add_node("find_missing_skills", find_missing_skills_node)
-    workflow.add_node("generate_feedback", generate_feedback_node)
-    workflow.add_node("calculate_trust_score", calculate_trust_score_node)
+    # Every node is wrapped so its latency lands in the node histogram
+    workflow.add_node("extract_text", instrument_node("extract_text", extract_text_node))
+    workflow.add_node("extract_skills", instrument_node("extract_skills", extract_skills_node))
+    workflow.add_node("process_jd", instrument_node("process_jd", process_jd_node))
+    workflow.add_node("calculate_similarity", instrument_node("calculate_similarity", calculate_similarity_node))
+    workflow.add_node("find_missing_skills", instrument_node("find_missing_skills", find_missing_skills_node))
+    workflow.add_node("calculate_trust_score", instrument_node("calculate_trust_score", calculate_trust_score_node))
 
     workflow.set_entry_point("extract_text")
-    workflow.add_edge("extract_text", "extract_skills")
-    workflow.add_edge("extract_skills", "process_jd")
-    workflow.add_edge("process_jd", "calculate_similarity")
-    workflow.add_edge("calculate_similarity", "find_missing_skills")
-    workflow.add_edge("find_missing_skills", "generate_feedback")
-    workflow.add_edge("generate_feedback", "calculate_trust_score")
-    workflow.add_edge("calculate_trust_score", END)
+
+    # Resume skills, JD skills and embedding similarity are independent:
+    # run them as parallel branches and join before comparing skills
+    branches = ["extract_skills", "process_jd", "calculate_similarity"]
+    for branch in branches:
+        workflow.add_edge("extract_text", branch)
+    workflow.add_edge(branches, "find_missing_skills")
+
+    # Score first so the trust score is available before the feedback is done
+    workflow.add_edge("find_missing_skills", "calculate_trust_score")
+    if include_feedback:
+        workflow.add_node("generate_feedback", instrument_node("generate_feedback", generate_feedback_node))
+        workflow.add_edge("calculate_trust_score", "generate_feedback")
+        workflow.add_edge("generate_feedback", END)
+    else:
+        workflow.add_edge("calculate_trust_score", END)
 
     # Add conditional edges if needed
     return workflow.compile()
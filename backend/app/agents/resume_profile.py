@@ -0,0 +1,137 @@
+import re
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
+from app.agents.skill_extractor import merge_skills
+from app.agents.skill_taxonomy import match_skills
+from app.services.chunking import skill_context
+from app.services.cache_service import resume_cache
+from app.services.pdf_service import ResumeDocument
+from app.core.config import settings
+from app.utils.metrics import llm_metrics, timed
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Deterministic extraction model for structured output
+llm = ChatGoogleGenerativeAI(
+    model=settings.LLM_MODEL,
+    temperature=0.0,
+    google_api_key=settings.GOOGLE_API_KEY,
+    base_url=settings.GEMINI_BASE_URL or None,
+    callbacks=[llm_metrics]
+)
+
+# Leading non-empty lines sent with the skill sections so the LLM can find the name
+NAME_LINES = 5
+
+class ResumeProfile(BaseModel):
+    """Per-resume facts extracted in a single structured LLM call."""
+    name: str = Field("Unknown Candidate", description="The candidate's full name")
+    skills: List[str] = Field(default_factory=list, description="Technical skills mentioned in the resume")
+    years_experience: Optional[float] = Field(None, description="Total years of professional experience, if stated")
+
+def extract_name_with_regex(text: str) -> str:
+    """Try to extract name using regex patterns"""
+    patterns = [
+        r"^(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]*)+)",  # First Last at start
+        r"\b(?:[A-Z][a-z]+ [A-Z]\. [A-Z][a-z]+)\b",  # First M. Last
+        r"Name:\s*(.+)",
+        r"Contact\s*Info\s*\n(.+)",
+        r"Resume\s*of\s*(.+)",
+        r"([A-Z][a-z]+ [A-Z][a-z]+)\s*\n\s*[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",  # Name followed by email
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, text, re.MULTILINE | re.IGNORECASE)
+        if match:
+            name = match.group(1).strip() if match.lastindex else match.group(0).strip()
+            # Clean up the name
+            name = re.sub(r"^(Resume|CV|Name|of|[:])", "", name, flags=re.IGNORECASE).strip()
+            return name
+
+    return ""
+
+def _parse_profile(response: str, parser: PydanticOutputParser) -> ResumeProfile:
+    """Validate the LLM's JSON answer, salvaging the name if it is malformed."""
+    try:
+        return parser.parse(response)
+    except Exception:
+        name_match = re.search(r'[\'"]?name[\'"]?\s*:\s*[\'"](.+?)[\'"]', response)
+        if name_match:
+            return ResumeProfile(name=name_match.group(1).strip())
+
+        # Use the first proper name structure found in the response
+        name_match = re.search(r'([A-Z][a-z]+ [A-Z][a-z]+)', response)
+        if name_match:
+            return ResumeProfile(name=name_match.group(0))
+        return ResumeProfile()
+
+async def analyze_resume(document: ResumeDocument) -> ResumeProfile:
+    """Candidate name, skills and years of experience for a parsed resume.
+
+    The regex name and the local taxonomy skills are used when they are good
+    enough; otherwise one structured LLM call returns whatever is missing.
+    Results are cached by the resume's content hash.
+    """
+    cached = resume_cache.get(document.content_hash, "profile")
+    if cached is not None:
+        return ResumeProfile(**cached)
+
+    resume_text = document.text
+    name = extract_name_with_regex(resume_text)
+    context = skill_context(resume_text)
+    skills = resume_cache.get(document.content_hash, "skills")
+    if skills is None:
+        skills = match_skills(context)
+
+    profile = ResumeProfile(name=name or "Unknown Candidate", skills=skills)
+    if not name or len(skills) < settings.SKILL_LOCAL_MIN_MATCHES:
+        parser = PydanticOutputParser(pydantic_object=ResumeProfile)
+        prompt = ChatPromptTemplate.from_template(
+            "Extract the candidate's full name, technical skills and total years of "
+            "professional experience from the resume text below. "
+            "The name is usually at the top of the resume. "
+            "If you cannot find a name, use \"Unknown Candidate\".\n"
+            "{format_instructions}\n\n"
+            "Resume Header:\n{header}\n\n"
+            "Resume Text:\n{text}"
+        )
+        # Without recognised sections the context is the whole resume, header included
+        header = "" if context == resume_text else "\n".join(
+            [line for line in resume_text.splitlines() if line.strip()][:NAME_LINES]
+        )
+        chain = prompt | llm | StrOutputParser()
+        with timed("analyze_resume_llm"):
+            response = await chain.ainvoke({
+                "format_instructions": parser.get_format_instructions(),
+                "header": header,
+                "text": context
+            })
+        extracted = _parse_profile(response, parser)
+        profile = ResumeProfile(
+            name=name or extracted.name or "Unknown Candidate",
+            skills=merge_skills(skills, extracted.skills),
+            years_experience=extracted.years_experience
+        )
+
+    resume_cache.set(document.content_hash, "skills", profile.skills)
+    resume_cache.set(document.content_hash, "profile", profile.model_dump())
+    return profile
+
+async def get_candidate_name(document: ResumeDocument) -> str:
+    """Candidate name only, without the LLM whenever the regex finds one.
+
+    A cached profile is reused; otherwise the structured call is made only
+    when the regex finds no name. Skills and experience are left for
+    analyze_resume, which ranking calls when it needs them.
+    """
+    cached = resume_cache.get(document.content_hash, "profile")
+    if cached is not None:
+        return cached["name"]
+    name = extract_name_with_regex(document.text)
+    if name:
+        return name
+    return (await analyze_resume(document)).name
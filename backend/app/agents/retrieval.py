@@ -0,0 +1,105 @@
+from typing import List, Tuple
+import numpy as np
+from app.core.config import settings
+from app.agents.trust_score import normalize_rows
+from app.services.chunking import chunk_resume
+from app.services.embedding_service import embedding_service
+from app.services.cache_service import resume_cache
+
+def get_resume_chunks(resume_hash: str, resume_text: str) -> Tuple[List[str], List[list]]:
+    """Section-aware chunks of a resume and their embeddings, cached by resume hash."""
+    return embed_resume_chunks([(resume_hash, resume_text)])[0]
+
+def embed_resume_chunks(resumes: List[Tuple[str, str]]) -> List[Tuple[List[str], List[list]]]:
+    """Chunk and embed many (resume_hash, resume_text) pairs.
+
+    Cached resumes are served from the resume cache; the chunks of all
+    remaining resumes are embedded together in batched calls.
+    """
+    results: List[Tuple[List[str], List[list]]] = [([], [])] * len(resumes)
+    pending = []
+    pending_texts = []
+    for i, (resume_hash, resume_text) in enumerate(resumes):
+        chunks = resume_cache.get(resume_hash, "chunks") if resume_hash else None
+        embeddings = resume_cache.get(resume_hash, "chunk_embeddings") if resume_hash else None
+        if chunks is not None and embeddings is not None:
+            results[i] = (chunks, embeddings)
+            continue
+        chunks = [chunk.text for chunk in chunk_resume(resume_text)]
+        pending.append((i, chunks))
+        pending_texts.extend(chunks)
+
+    if pending_texts:
+        vectors = embedding_service.embed_batch(pending_texts)
+        offset = 0
+        for i, chunks in pending:
+            embeddings = vectors[offset:offset + len(chunks)]
+            offset += len(chunks)
+            results[i] = (chunks, embeddings)
+            resume_hash = resumes[i][0]
+            if resume_hash:
+                resume_cache.set(resume_hash, "chunks", chunks)
+                resume_cache.set(resume_hash, "chunk_embeddings", embeddings)
+    return results
+
+def score_candidates(
+    chunk_embeddings: List[List[list]],
+    queries
+) -> List[Tuple[float, List[int]]]:
+    """Score each candidate's chunks against the JD requirements.
+
+    `queries` holds one embedding per JD requirement (or just the JD
+    embedding), as a matrix or a list of vectors. All candidates' chunks are stacked and scored with a single
+    normalised matrix product. A candidate's similarity is the mean, over
+    requirements, of its best-matching chunk; the indices of those chunks
+    (best first, at most RETRIEVAL_TOP_CHUNKS) are returned as evidence.
+    """
+    results: List[Tuple[float, List[int]]] = [(0.0, [])] * len(chunk_embeddings)
+    sizes = [len(embeddings) for embeddings in chunk_embeddings]
+    if len(queries) == 0 or sum(sizes) == 0:
+        return results
+
+    stacked = normalize_rows([vector for embeddings in chunk_embeddings for vector in embeddings])
+    scores = stacked @ normalize_rows(queries).T  # (total chunks, requirements)
+
+    start = 0
+    for i, size in enumerate(sizes):
+        if size == 0:
+            continue
+        block = scores[start:start + size]
+        start += size
+
+        best_chunks = block.argmax(axis=0)
+        best_scores = block.max(axis=0)
+        ranked = []
+        for chunk_index in best_chunks[np.argsort(-best_scores)]:
+            if int(chunk_index) not in ranked:
+                ranked.append(int(chunk_index))
+        results[i] = (float(best_scores.mean()), ranked[:settings.RETRIEVAL_TOP_CHUNKS])
+    return results
+
+def similarity_matrix(chunk_embeddings: List[List[list]], query_sets: list) -> np.ndarray:
+    """(candidates x query sets) matrix of score_candidates similarities.
+
+    Every candidate's chunks are scored against every query set (one per
+    job description) with a single matrix product; the best chunk per
+    requirement and the mean per query set are taken with reduceat, so no
+    Python loop runs over candidate/JD pairs.
+    """
+    result = np.zeros((len(chunk_embeddings), len(query_sets)), dtype=np.float32)
+    sizes = np.array([len(embeddings) for embeddings in chunk_embeddings], dtype=np.int64)
+    widths = np.array([len(queries) for queries in query_sets], dtype=np.int64)
+    rows = np.flatnonzero(sizes)
+    columns = np.flatnonzero(widths)
+    if len(rows) == 0 or len(columns) == 0:
+        return result
+
+    stacked = normalize_rows([vector for embeddings in chunk_embeddings for vector in embeddings])
+    queries = np.vstack([normalize_rows(query_sets[j]) for j in columns])
+    scores = stacked @ queries.T  # (total chunks, total requirements)
+
+    # Best chunk per (candidate, requirement), then mean per JD
+    best = np.maximum.reduceat(scores, np.concatenate(([0], np.cumsum(sizes[rows])[:-1])), axis=0)
+    column_starts = np.concatenate(([0], np.cumsum(widths[columns])[:-1]))
+    result[np.ix_(rows, columns)] = np.add.reduceat(best, column_starts, axis=1) / widths[columns]
+    return result
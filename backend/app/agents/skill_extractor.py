@@ -1,15 +1,44 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from app.agents.skill_taxonomy import canonical_skill, match_skills
 from app.core.config import settings
+from app.utils.metrics import llm_metrics, timed
 
 llm = ChatGoogleGenerativeAI(
     model=settings.LLM_MODEL,
     temperature=0.7,
-    google_api_key=settings.GOOGLE_API_KEY
+    google_api_key=settings.GOOGLE_API_KEY,
+    base_url=settings.GEMINI_BASE_URL or None,
+    callbacks=[llm_metrics]
 )
 
 def extract_skills(text: str, context: str = "resume") -> list:
+    """Extract skills from text.
+
+    Skills are first matched locally against the skill taxonomy. Gemini is
+    only called when fewer than SKILL_LOCAL_MIN_MATCHES skills were found;
+    its answer is then merged into the local matches.
+    """
+    with timed("extract_skills"):
+        skills = match_skills(text)
+        if len(skills) >= settings.SKILL_LOCAL_MIN_MATCHES:
+            return skills
+
+        return merge_skills(skills, extract_skills_with_llm(text, context))
+
+def merge_skills(skills: list, extra: list) -> list:
+    """Append LLM-reported skills, mapped to canonical names, without duplicates."""
+    merged = list(skills)
+    seen = {skill.lower() for skill in merged}
+    for skill in extra:
+        skill = canonical_skill(skill)
+        if skill and skill.lower() not in seen:
+            merged.append(skill)
+            seen.add(skill.lower())
+    return merged
+
+def extract_skills_with_llm(text: str, context: str = "resume") -> list:
     """Extract skills from text using Gemini Pro."""
     prompt_type = {
         "resume": "Extract technical skills from this resume text. Return ONLY comma-separated values:",
@@ -21,4 +50,4 @@ def extract_skills(text: str, context: str = "resume") -> list:
     ) 
     chain = prompt | llm | StrOutputParser()
     skills = chain.invoke({"text": text})
-    return [s.strip() for s in skills.split(",") if s.strip()]   
\ No newline at end of file
+    return [s.strip() for s in skills.split(",") if s.strip()]
@@ -0,0 +1,111 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+import numpy as np
+from app.core.config import settings
+from app.agents.skill_taxonomy import canonical_skill
+from app.agents.trust_score import normalize_rows
+from app.services.embedding_service import embedding_service
+from app.services.cache_service import content_hash, skill_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SkillComparison:
+    # Required skill -> the resume skill that satisfies it
+    matched: Dict[str, str] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+
+def normalize_skill(skill: str) -> str:
+    """Canonical, lowercased form of a skill string ("Postgres" -> "postgresql")."""
+    skill = canonical_skill(skill).lower()
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9+#. ]", " ", skill)).strip()
+
+def get_skill_vectors(skills: List[str]) -> np.ndarray:
+    """Embeddings of normalised skill strings, served from the skill-vector store.
+
+    Only skills never seen before are embedded, in one batch call.
+    """
+    keys = [content_hash(skill.encode("utf-8")) for skill in skills]
+    vectors = [skill_cache.get(key, "embedding") for key in keys]
+
+    pending = [i for i, vector in enumerate(vectors) if vector is None]
+    if pending:
+        embedded = embedding_service.embed_batch([skills[i] for i in pending])
+        for i, vector in zip(pending, embedded):
+            vectors[i] = vector
+            skill_cache.set(keys[i], "embedding", vector)
+    return normalize_rows(vectors)
+
+def compare_skills(required: List[str], extracted: List[str]) -> SkillComparison:
+    """Match required skills against resume skills.
+
+    Skills are normalised through the taxonomy first; whatever is still
+    unmatched is compared with a cosine similarity matrix between the
+    required and extracted skill embeddings, matching above
+    SKILL_MATCH_THRESHOLD.
+    """
+    comparison = SkillComparison()
+    extracted_by_key = {}
+    for skill in extracted:
+        extracted_by_key.setdefault(normalize_skill(skill), skill)
+
+    unmatched = []
+    for skill in dict.fromkeys(required):
+        key = normalize_skill(skill)
+        if key in extracted_by_key:
+            comparison.matched[skill] = extracted_by_key[key]
+        else:
+            unmatched.append(skill)
+
+    if unmatched and extracted_by_key:
+        try:
+            extracted_keys = list(extracted_by_key)
+            required_vectors = get_skill_vectors([normalize_skill(skill) for skill in unmatched])
+            extracted_vectors = get_skill_vectors(extracted_keys)
+            similarity = required_vectors @ extracted_vectors.T
+            best = similarity.argmax(axis=1)
+            for row, skill in enumerate(unmatched):
+                if similarity[row, best[row]] >= settings.SKILL_MATCH_THRESHOLD:
+                    comparison.matched[skill] = extracted_by_key[extracted_keys[best[row]]]
+        except Exception as e:
+            # Exact (normalised) matches are still valid without embeddings
+            logger.error(f"Skill embedding error: {str(e)}")
+
+    comparison.missing = [skill for skill in unmatched if skill not in comparison.matched]
+    return comparison
+
+def skill_match_matrix(required: List[str], extracted_sets: List[List[str]]) -> np.ndarray:
+    """Boolean (required skills x resumes) matrix: does resume j cover skill i?
+
+    Uses the same rules as compare_skills (normalised equality, then cosine
+    above SKILL_MATCH_THRESHOLD) but compares every distinct skill once and
+    projects the matches onto the resumes with a single matrix product.
+    """
+    required_keys = [normalize_skill(skill) for skill in required]
+    extracted_index: Dict[str, int] = {}
+    for skills in extracted_sets:
+        for skill in skills:
+            extracted_index.setdefault(normalize_skill(skill), len(extracted_index))
+    if not required_keys or not extracted_index:
+        return np.zeros((len(required_keys), len(extracted_sets)), dtype=bool)
+
+    # Which resume mentions which distinct skill
+    incidence = np.zeros((len(extracted_index), len(extracted_sets)), dtype=np.float32)
+    for j, skills in enumerate(extracted_sets):
+        for skill in skills:
+            incidence[extracted_index[normalize_skill(skill)], j] = 1.0
+
+    extracted_keys = list(extracted_index)
+    matches = np.zeros((len(required_keys), len(extracted_keys)), dtype=bool)
+    for i, key in enumerate(required_keys):
+        if key in extracted_index:
+            matches[i, extracted_index[key]] = True
+    try:
+        similarity = get_skill_vectors(required_keys) @ get_skill_vectors(extracted_keys).T
+        matches |= similarity >= settings.SKILL_MATCH_THRESHOLD
+    except Exception as e:
+        # Exact (normalised) matches are still valid without embeddings
+        logger.error(f"Skill embedding error: {str(e)}")
+    return (matches.astype(np.float32) @ incidence) > 0
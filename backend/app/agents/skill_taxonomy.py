@@ -0,0 +1,315 @@
+import re
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+# Canonical skill name -> aliases. The canonical name is an alias of itself,
+# except for the AMBIGUOUS_SKILLS below.
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    # Programming languages
+    "Python": ["python3", "python 3"],
+    "Java": ["java 8", "java 11", "java 17", "core java"],
+    "JavaScript": ["js", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": [],
+    "C": ["c language", "c programming", "ansi c"],
+    "C++": ["cpp", "c plus plus"],
+    "C#": ["c sharp", "csharp"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust lang", "rustlang"],
+    "Ruby": ["ruby programming", "ruby language"],
+    "PHP": [],
+    "Kotlin": [],
+    "Swift": ["swiftui", "swift programming", "swift 5"],
+    "Scala": [],
+    "R": ["r programming", "r language", "rstudio"],
+    "MATLAB": [],
+    "Perl": [],
+    "Dart": ["dart programming", "dart language"],
+    "Bash": ["shell scripting", "shell script", "bash scripting"],
+    "PowerShell": [],
+    "SQL": ["structured query language", "t-sql", "tsql", "pl/sql", "plsql"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "Sass": ["scss"],
+    # Web frameworks and libraries
+    "React": ["react.js", "reactjs"],
+    "React Native": [],
+    "Angular": ["angularjs", "angular.js"],
+    "Vue.js": ["vue", "vuejs"],
+    "Next.js": ["nextjs"],
+    "Node.js": ["nodejs", "node js"],
+    "Express.js": ["expressjs", "express js"],
+    "Django": ["django rest framework", "drf"],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring Boot": ["spring framework", "spring mvc"],
+    "Ruby on Rails": ["rails", "ror"],
+    "ASP.NET": ["asp.net core"],
+    ".NET": [".net framework", ".net core", "dotnet"],
+    "Laravel": [],
+    "GraphQL": [],
+    "REST APIs": ["restful", "rest api", "rest apis", "restful apis", "restful api"],
+    "gRPC": [],
+    "Redux": [],
+    "Tailwind CSS": ["tailwind", "tailwindcss"],
+    "Bootstrap": ["bootstrap css", "bootstrap 4", "bootstrap 5"],
+    "jQuery": [],
+    "Flutter": [],
+    # Data and ML
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["dl"],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": [],
+    "Large Language Models": ["llm", "llms"],
+    "Generative AI": ["genai", "gen ai"],
+    "Retrieval-Augmented Generation": ["rag"],
+    "Prompt Engineering": [],
+    "LangChain": [],
+    "LangGraph": [],
+    "Hugging Face": ["huggingface"],
+    "TensorFlow": ["tensorflow 2"],
+    "Keras": [],
+    "PyTorch": ["torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "XGBoost": [],
+    "LightGBM": [],
+    "Pandas": [],
+    "NumPy": [],
+    "SciPy": [],
+    "Matplotlib": [],
+    "Seaborn": [],
+    "Jupyter": ["jupyter notebook", "jupyter notebooks"],
+    "OpenCV": [],
+    "spaCy": [],
+    "NLTK": [],
+    "FAISS": [],
+    "Statistics": ["statistical analysis", "statistical modeling"],
+    "Data Analysis": ["data analytics"],
+    "Data Visualization": [],
+    "Data Engineering": [],
+    "ETL": ["elt", "data pipelines", "data pipeline"],
+    "Apache Spark": ["spark", "pyspark"],
+    "Hadoop": ["hdfs"],
+    "Apache Kafka": ["kafka"],
+    "Apache Airflow": ["airflow"],
+    "dbt": [],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": ["microsoft excel", "ms excel", "advanced excel", "excel spreadsheets"],
+    "MLOps": [],
+    "MLflow": [],
+    # Databases
+    "PostgreSQL": ["postgres", "postgresql", "psql"],
+    "MySQL": [],
+    "SQLite": [],
+    "Oracle Database": ["oracle", "oracle db"],
+    "Microsoft SQL Server": ["sql server", "mssql", "ms sql"],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Cassandra": [],
+    "Elasticsearch": ["elastic search", "elk"],
+    "DynamoDB": [],
+    "Snowflake": [],
+    "BigQuery": ["big query"],
+    "Neo4j": [],
+    # Cloud and DevOps
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "Google Cloud": ["gcp", "google cloud platform"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "GitHub Actions": [],
+    "GitLab CI": ["gitlab ci/cd"],
+    "CI/CD": ["ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Git": ["github", "gitlab", "bitbucket", "version control"],
+    "Linux": ["unix", "ubuntu", "centos", "red hat"],
+    "Nginx": [],
+    "Serverless": [],
+    "Microservices": ["microservice", "micro-services"],
+    "Prometheus": [],
+    "Grafana": [],
+    "DevOps": [],
+    # Testing and practices
+    "Unit Testing": ["unit tests"],
+    "pytest": [],
+    "JUnit": [],
+    "Jest": [],
+    "Selenium": [],
+    "Cypress": [],
+    "Test-Driven Development": ["tdd"],
+    "Agile": ["scrum", "kanban", "agile methodology", "agile methodologies", "agile development"],
+    "Jira": [],
+    "System Design": [],
+    "Object-Oriented Programming": ["oop", "object oriented programming"],
+    "Data Structures": ["data structures and algorithms", "dsa"],
+    # Security and networking
+    "Cybersecurity": ["information security", "infosec", "cyber security"],
+    "OAuth": ["oauth2", "oauth 2.0"],
+    "Networking": ["tcp/ip", "computer networking", "network engineering"],
+    # Mobile
+    "Android": ["android development"],
+    "iOS": ["ios development"],
+}
+
+# Canonical names that are single letters or ordinary English words ("go",
+# "excel at", "agile team", a "C." initial). They are only matched through
+# their context aliases above ("golang", "c programming", "microsoft excel").
+AMBIGUOUS_SKILLS = {"C", "R", "Go", "Swift", "Rust", "Ruby", "Dart", "Excel", "Agile", "Bootstrap", "Networking"}
+
+# Aliases that are common words but usually mean the skill ("react to",
+# "spark interest", "a java"). They only count within SKILL_CONTEXT_WINDOW
+# characters of another skill, as in a skills list or "Java/Spring Boot";
+# a chain of them needs at least one other skill to anchor it.
+CONTEXT_ALIASES = {"react", "spark", "rails", "ml", "dl", "oracle", "java"}
+SKILL_CONTEXT_WINDOW = 40
+
+# Aliases that name more than one skill. The first is the canonical_skill()
+# answer; match_skills() reports all of them.
+MULTI_SKILL_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "aws lambda": ("Serverless", "AWS"),
+}
+
+def normalize(text: str) -> str:
+    """Lowercase, keep characters that matter in skill names, collapse whitespace.
+
+    The result is padded with spaces so that a pattern " python " only
+    matches whole words. "/" and "-" are kept, for aliases such as "ci/cd"
+    and "t-sql"; _split_tokens() gives the same text with them as separators.
+    """
+    text = text.lower()
+    # A dot only belongs to a token when followed by a letter/digit ("node.js", ".net")
+    text = re.sub(r"\.(?![a-z0-9])", " ", text)
+    text = re.sub(r"[^a-z0-9+#./\- ]+", " ", text)
+    return f" {' '.join(text.split())} "
+
+def _split_tokens(normalized: str) -> str:
+    """`normalized` with "/" and "-" as word separators ("html/css", "docker-compose").
+
+    The length is unchanged, so match offsets line up with the whole-token text.
+    """
+    return normalized.replace("/", " ").replace("-", " ")
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every pattern occurrence in one pass over the text."""
+
+    def __init__(self, patterns: Dict[str, Any]):
+        # Trie of goto transitions; outputs hold (pattern length, value) per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, Any]]] = [[]]
+
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._outputs[state].append((len(pattern), value))
+
+        # Breadth-first construction of failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, Any]]:
+        """Return (start, end, value) for every match in `text`."""
+        matches = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._outputs[state]:
+                matches.append((i - length + 1, i + 1, value))
+        return matches
+
+def _build_matcher() -> AhoCorasick:
+    patterns = {}
+    for canonical, aliases in SKILL_TAXONOMY.items():
+        names = aliases if canonical in AMBIGUOUS_SKILLS else [canonical, *aliases]
+        for alias in names:
+            key = normalize(alias)
+            if key.strip():
+                patterns.setdefault(key, (canonical,))
+    for alias, canonicals in MULTI_SKILL_ALIASES.items():
+        patterns[normalize(alias)] = canonicals
+    return AhoCorasick(patterns)
+
+_matcher = _build_matcher()
+# Exact canonical names, including the ambiguous ones the matcher leaves out
+_canonical_names = {normalize(canonical): canonical for canonical in SKILL_TAXONOMY}
+_context_keys = {normalize(alias) for alias in CONTEXT_ALIASES}
+
+def canonical_skill(skill: str) -> str:
+    """Map a skill string to its canonical taxonomy name, if it has one.
+
+    A skill given on its own (e.g. by the LLM) is unambiguous, so "go" maps
+    to "Go" here even though match_skills only finds it as "golang".
+    """
+    key = normalize(skill)
+    if key in _canonical_names:
+        return _canonical_names[key]
+    for start, end, canonicals in _matcher.find_all(key):
+        if start == 0 and end == len(key):
+            return canonicals[0]
+    return skill.strip()
+
+def match_skills(text: str) -> List[str]:
+    """Canonical skills found in `text`, in order of first appearance.
+
+    The text is matched both as whole tokens and split on "/" and "-", and
+    overlapping matches are resolved leftmost-longest, so "React Native" is
+    not also reported as "React". CONTEXT_ALIASES are dropped unless they
+    are near another skill.
+    """
+    normalized = normalize(text)
+    found = set()
+    for candidate in (normalized, _split_tokens(normalized)):
+        found.update(_matcher.find_all(candidate))
+    # Padding spaces are shared between neighbouring words, so compare spans without them
+    matches = sorted(
+        ((start + 1, end - 1, normalized[start:end], canonicals) for start, end, canonicals in found),
+        key=lambda match: (match[0], -(match[1] - match[0]))
+    )
+    resolved = []
+    covered_until = -1
+    for start, end, key, canonicals in matches:
+        if start < covered_until:
+            continue
+        covered_until = end
+        resolved.append((start, end, key, canonicals))
+
+    # Context aliases count when near an accepted skill, which grows from the unambiguous ones
+    accepted = [match for match in resolved if _split_tokens(match[2]) not in _context_keys]
+    pending = [match for match in resolved if _split_tokens(match[2]) in _context_keys]
+    while pending:
+        near = [
+            match for match in pending
+            if any(
+                other[0] - match[1] <= SKILL_CONTEXT_WINDOW and match[0] - other[1] <= SKILL_CONTEXT_WINDOW
+                for other in accepted
+            )
+        ]
+        if not near:
+            break
+        accepted.extend(near)
+        pending = [match for match in pending if match not in near]
+
+    skills = []
+    for _, _, _, canonicals in sorted(accepted):
+        for canonical in canonicals:
+            if canonical not in skills:
+                skills.append(canonical)
+    return skills
@@ -1,14 +1,16 @@
+from typing import Optional
 import numpy as np
+from app.core.config import settings
 
 def calculate_trust_score(state) -> float:
     """Calculate trust score based on similarity and skill coverage."""
     try:
-        # Get skills safely
-        extracted = set(state.extracted_skills or [])
+        # Get skills safely; missing_skills already accounts for fuzzy matches
         required = set(state.required_skills or [])
+        missing = set(state.missing_skills or [])
         
         # Calculate coverage
-        coverage = len(extracted & required) 
+        coverage = len(required - missing)
         if len(required) > 0:
             coverage /= len(required)
         else:
@@ -18,17 +20,40 @@ def calculate_trust_score(state) -> float:
         similarity = state.similarity_score or 0.0
         
         # Calculate trust score
-        return round((similarity * 0.5 + coverage * 0.5) * 100, 2)
+        weight = settings.TRUST_SIMILARITY_WEIGHT
+        return round((similarity * weight + coverage * (1 - weight)) * 100, 2)
     except Exception as e:
         print(f"Error calculating trust score: {e}")
         return 0.0
 
-def calculate_similarity(embedding1, embedding2) -> float:
-    """Calculate cosine similarity between two embeddings."""
-    try:
-        a = np.array(embedding1)
-        b = np.array(embedding2)
-        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
-    except Exception as e:
-        print(f"Error calculating similarity: {e}")
-        return 0.0
\ No newline at end of file
+def normalize_rows(embeddings) -> np.ndarray:
+    """Stack embeddings into a float32 matrix with L2-normalised rows."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def trust_score_matrix(
+    similarity: np.ndarray,
+    coverage: np.ndarray,
+    similarity_weight: Optional[float] = None
+) -> np.ndarray:
+    """Vectorised calculate_trust_score over equally shaped similarity and coverage matrices."""
+    weight = settings.TRUST_SIMILARITY_WEIGHT if similarity_weight is None else similarity_weight
+    similarity = np.asarray(similarity, dtype=np.float64)
+    coverage = np.asarray(coverage, dtype=np.float64)
+    return np.round((similarity * weight + coverage * (1 - weight)) * 100, 2)
+
+def weighted_coverage(covered: np.ndarray, skill_weights: np.ndarray) -> np.ndarray:
+    """Per-candidate share of the required-skill weight that is covered.
+
+    `covered` is a (candidates x required skills) 0/1 incidence matrix; with
+    all weights equal to 1 this is the plain coverage used by
+    calculate_trust_score.
+    """
+    total = float(skill_weights.sum())
+    if covered.shape[1] == 0 or total <= 0:
+        return np.zeros(covered.shape[0], dtype=np.float64)
+    return (covered @ skill_weights) / total
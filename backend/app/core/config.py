@@ -7,5 +7,59 @@ class Settings:
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY")
     EMBEDDING_MODEL: str = "models/embedding-001"
     LLM_MODEL: str = "gemini-2.0-flash"
+    # Alternative Gemini API endpoint, e.g. the load-test mock server (empty uses Google's)
+    GEMINI_BASE_URL: str = os.getenv("GEMINI_BASE_URL", "")
 
-settings = Settings()
\ No newline at end of file
+    # Number of texts sent per batch embedding request
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
+
+    # Content-addressed resume cache (in-memory LRU + optional SQLite tier)
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_DB_PATH: str = os.getenv("CACHE_DB_PATH", "")
+
+    # Section-aware resume chunking and retrieval
+    CHUNK_CHARS: int = int(os.getenv("CHUNK_CHARS", "800"))
+    CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "100"))
+    RETRIEVAL_TOP_CHUNKS: int = int(os.getenv("RETRIEVAL_TOP_CHUNKS", "4"))
+
+    # Local taxonomy skill matching; the LLM is only asked when fewer skills are found
+    SKILL_LOCAL_MIN_MATCHES: int = int(os.getenv("SKILL_LOCAL_MIN_MATCHES", "5"))
+
+    # Fuzzy skill matching: cosine threshold and persistent skill-vector store
+    SKILL_MATCH_THRESHOLD: float = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.85"))
+    SKILL_VECTOR_DB_PATH: str = os.getenv("SKILL_VECTOR_DB_PATH", "data/skill_vectors.db")
+
+    # Registered resumes (POST /resumes), referenced by content hash in later requests
+    RESUME_REGISTRY_DB_PATH: str = os.getenv("RESUME_REGISTRY_DB_PATH", "data/resume_registry.db")
+
+    # Trust score blend: weight of embedding similarity (the rest is skill coverage)
+    TRUST_SIMILARITY_WEIGHT: float = float(os.getenv("TRUST_SIMILARITY_WEIGHT", "0.5"))
+
+    # Maximum number of candidates scored concurrently per ranking request
+    RANK_CONCURRENCY: int = int(os.getenv("RANK_CONCURRENCY", "8"))
+    # Opt-in: only the top-K resumes by BM25 against the JD go through the full pipeline (0, the default, scores every resume)
+    RANK_PREFILTER_TOP_K: int = int(os.getenv("RANK_PREFILTER_TOP_K", "0"))
+
+    # Durable batch-ranking jobs
+    JOBS_DB_PATH: str = os.getenv("JOBS_DB_PATH", "data/jobs.db")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+
+    # Bulk archive ingestion: per-member size cap and maximum number of PDFs read
+    ARCHIVE_MAX_MEMBER_BYTES: int = int(os.getenv("ARCHIVE_MAX_MEMBER_BYTES", str(10 * 1024 * 1024)))
+    ARCHIVE_MAX_MEMBERS: int = int(os.getenv("ARCHIVE_MAX_MEMBERS", "5000"))
+
+    # Persistent FAISS candidate index
+    INDEX_DIR: str = os.getenv("INDEX_DIR", "data/candidate_index")
+    # Pools at least this large use an approximate index ("hnsw" or "ivf")
+    INDEX_LARGE_POOL_SIZE: int = int(os.getenv("INDEX_LARGE_POOL_SIZE", "10000"))
+    INDEX_LARGE_TYPE: str = os.getenv("INDEX_LARGE_TYPE", "hnsw")
+    INDEX_HNSW_M: int = int(os.getenv("INDEX_HNSW_M", "32"))
+    INDEX_IVF_NPROBE: int = int(os.getenv("INDEX_IVF_NPROBE", "8"))
+
+    # Opt-in request profiles (X-Profile: 1 or ?profile=1) are written here.
+    # The event loop is only profiled while no other request is in flight;
+    # overlapping_requests in a profile's summary counts requests that arrived
+    # during it, whose coroutine work is then mixed into the profile.
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "data/profiles")
+
+settings = Settings()
@@ -1,23 +1,24 @@
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-import operator
-from functools import reduce
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+import numpy as np
 
 class AgentState(BaseModel):
+    # Embeddings are float32 arrays shared with the JobProfile: pydantic only
+    # checks their type, and they are never copied into dumps
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    resume_hash: str = ""
     resume_text: str = ""
     job_description: str = ""
     extracted_skills: List[str] = []
     required_skills: List[str] = []
     missing_skills: List[str] = []
     similarity_score: float = 0.0
+    # Set when the caller already scored similarity (batch ranking)
+    similarity_scored: bool = False
+    relevant_chunks: List[str] = []
     feedback_report: str = ""
     trust_score: float = 0.0
-    resume_embedding: Optional[List[float]] = None
-    jd_embedding: Optional[List[float]] = None
-
-    def __add__(self, other: Dict[str, Any]) -> "AgentState":
-        state_dict = self.dict()
-        for key, value in other.items():
-            if key in state_dict:
-                state_dict[key] = value
-        return AgentState(**state_dict)
\ No newline at end of file
+    jd_embedding: Optional[np.ndarray] = Field(None, exclude=True, repr=False)
+    # One row per required skill
+    requirement_embeddings: Optional[np.ndarray] = Field(None, exclude=True, repr=False)
@@ -0,0 +1,85 @@
+import os
+import tarfile
+import zipfile
+from typing import BinaryIO, Iterator, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+PDF_MAGIC = b"%PDF"
+
+def _is_candidate_member(name: str, size: int, max_member_bytes: int) -> bool:
+    """Cheap checks on a member's header, before any of its bytes are read."""
+    basename = os.path.basename(name)
+    if not basename.lower().endswith(".pdf") or basename.startswith("._") or "__MACOSX/" in name:
+        return False
+    if size > max_member_bytes:
+        logger.warning(f"Skipping oversized archive member: {name} ({size} bytes)")
+        return False
+    return True
+
+def _read_member(stream: BinaryIO, name: str, max_member_bytes: int) -> bytes:
+    """Read at most max_member_bytes; returns b"" for oversized or non-PDF content."""
+    head = stream.read(len(PDF_MAGIC))
+    if head != PDF_MAGIC:
+        logger.warning(f"Skipping archive member that is not a PDF: {name}")
+        return b""
+    # Declared sizes can lie (zip bombs), so bound the actual read as well
+    body = stream.read(max_member_bytes - len(PDF_MAGIC) + 1)
+    if len(head) + len(body) > max_member_bytes:
+        logger.warning(f"Skipping oversized archive member: {name}")
+        return b""
+    return head + body
+
+def _iter_zip(archive: zipfile.ZipFile, max_member_bytes: int, max_members: int) -> Iterator[Tuple[str, bytes]]:
+    count = 0
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or not _is_candidate_member(info.filename, info.file_size, max_member_bytes):
+                continue
+            with archive.open(info) as stream:
+                pdf_bytes = _read_member(stream, info.filename, max_member_bytes)
+            if pdf_bytes:
+                yield info.filename, pdf_bytes
+                count += 1
+                if count >= max_members:
+                    logger.warning(f"Archive member limit reached ({max_members}), ignoring the rest")
+                    return
+
+def _iter_tar(archive: tarfile.TarFile, max_member_bytes: int, max_members: int) -> Iterator[Tuple[str, bytes]]:
+    count = 0
+    with archive:
+        # Stream mode: members are visited once, in order, without seeking back
+        for member in archive:
+            if not member.isfile() or not _is_candidate_member(member.name, member.size, max_member_bytes):
+                continue
+            stream = archive.extractfile(member)
+            if stream is None:
+                continue
+            pdf_bytes = _read_member(stream, member.name, max_member_bytes)
+            if pdf_bytes:
+                yield member.name, pdf_bytes
+                count += 1
+                if count >= max_members:
+                    logger.warning(f"Archive member limit reached ({max_members}), ignoring the rest")
+                    return
+
+def iter_archive_pdfs(fileobj: BinaryIO, max_member_bytes: int, max_members: int) -> Iterator[Tuple[str, bytes]]:
+    """Yield (member name, PDF bytes) for each PDF in a ZIP or TAR archive.
+
+    Members are read one at a time, so only one PDF is held in memory per
+    step. Non-PDF names, oversized members and files without a PDF header
+    are skipped without being fully read. The format is detected eagerly:
+    a ValueError is raised here, not on first iteration, for anything that
+    is neither a ZIP nor a (optionally compressed) TAR archive.
+    """
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        return _iter_zip(zipfile.ZipFile(fileobj), max_member_bytes, max_members)
+
+    fileobj.seek(0)
+    try:
+        archive = tarfile.open(fileobj=fileobj, mode="r|*")
+    except tarfile.TarError:
+        raise ValueError("Unsupported archive: expected a ZIP or TAR file")
+    return _iter_tar(archive, max_member_bytes, max_members)
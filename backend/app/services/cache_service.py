@@ -0,0 +1,184 @@
+import os
+import json
+import queue
+import atexit
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 hex digest used as the cache key for a document."""
+    return hashlib.sha256(content).hexdigest()
+
+class ContentCache:
+    """Cache of per-document artifacts keyed by the SHA-256 of the content.
+
+    Entries live in a bounded in-memory LRU. When a SQLite path is given,
+    every write also goes to disk so results survive restarts and are shared
+    between processes. Disk writes are handed to a writer thread that commits
+    them in batches, so set() never waits on SQLite from the event loop.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024, db_path: Optional[str] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._db = None
+        # Serialized values queued for the writer thread, readable until committed
+        self._unwritten: Dict[Tuple[str, str], str] = {}
+        self._writes: "queue.Queue[Tuple[str, str, str]]" = queue.Queue()
+        if db_path:
+            if os.path.dirname(db_path):
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.name}_cache ("
+                "key TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL, "
+                "PRIMARY KEY (key, field))"
+            )
+            self._db.commit()
+            threading.Thread(
+                target=self._write_loop, args=(db_path,), name=f"{self.name}-cache-writer", daemon=True
+            ).start()
+            atexit.register(self.flush)
+
+    def get(self, key: str, field: str) -> Optional[Any]:
+        """Return the cached value of `field` for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and field in entry:
+                self._entries.move_to_end(key)
+                self._hits[field] = self._hits.get(field, 0) + 1
+                return entry[field]
+
+            value = self._load(key, field)
+            if value is None:
+                self._misses[field] = self._misses.get(field, 0) + 1
+                return None
+
+            self._remember(key, field, value)
+            self._hits[field] = self._hits.get(field, 0) + 1
+            return value
+
+    def set(self, key: str, field: str, value: Any) -> None:
+        """Store `value` as `field` of `key` in memory and queue it for disk."""
+        with self._lock:
+            self._remember(key, field, value)
+            if self._db is not None:
+                serialized = json.dumps(value)
+                self._unwritten[(key, field)] = serialized
+                self._writes.put((key, field, serialized))
+
+    def flush(self) -> None:
+        """Block until every queued disk write is committed."""
+        if self._db is not None:
+            self._writes.join()
+
+    def _write_loop(self, db_path: str) -> None:
+        """Writer thread: commit whatever has been queued since the last batch."""
+        db = sqlite3.connect(db_path)
+        while True:
+            batch = [self._writes.get()]
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                db.executemany(
+                    f"INSERT OR REPLACE INTO {self.name}_cache (key, field, value) VALUES (?, ?, ?)",
+                    batch
+                )
+                db.commit()
+            except Exception as e:
+                logger.error(f"Cache write error: {str(e)}")
+            with self._lock:
+                for key, field, serialized in batch:
+                    # A newer value for the same field may already be queued behind this one
+                    if self._unwritten.get((key, field)) is serialized:
+                        del self._unwritten[(key, field)]
+            for _ in batch:
+                self._writes.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self._db is not None,
+                "hits": sum(self._hits.values()),
+                "misses": sum(self._misses.values()),
+                "hits_by_field": dict(self._hits),
+                "misses_by_field": dict(self._misses),
+            }
+
+    def _remember(self, key: str, field: str, value: Any) -> None:
+        entry = self._entries.setdefault(key, {})
+        entry[field] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str, field: str) -> Optional[Any]:
+        if self._db is None:
+            return None
+        if (key, field) in self._unwritten:
+            return json.loads(self._unwritten[(key, field)])
+        try:
+            row = self._db.execute(
+                f"SELECT value FROM {self.name}_cache WHERE key = ? AND field = ?",
+                (key, field)
+            ).fetchone()
+        except Exception as e:
+            logger.error(f"Cache read error: {str(e)}")
+            return None
+        return json.loads(row[0]) if row else None
+
+resume_cache = ContentCache(
+    "resume",
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    db_path=settings.CACHE_DB_PATH or None
+)
+
+job_cache = ContentCache(
+    "job",
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    db_path=settings.CACHE_DB_PATH or None
+)
+
+candidate_cache = ContentCache(
+    "candidate",
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    db_path=settings.CACHE_DB_PATH or None
+)
+
+# Per-ranking candidate features kept for rescoring without re-running the pipeline
+ranking_cache = ContentCache(
+    "ranking",
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    db_path=settings.CACHE_DB_PATH or None
+)
+
+# Registered resumes are always persisted; clients hold on to their ids
+resume_registry = ContentCache(
+    "registry",
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    db_path=settings.RESUME_REGISTRY_DB_PATH or None
+)
+
+# Skill vectors are always persisted so each distinct skill is embedded once per deployment
+skill_cache = ContentCache(
+    "skill",
+    max_entries=settings.CACHE_MAX_ENTRIES * 8,
+    db_path=settings.SKILL_VECTOR_DB_PATH or None
+)
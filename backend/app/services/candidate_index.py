@@ -0,0 +1,236 @@
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Set
+import numpy as np
+import faiss
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CandidateIndex:
+    """Persistent FAISS index over the embeddings of every ingested resume.
+
+    Small pools use an exact inner-product index. Once the pool reaches
+    INDEX_LARGE_POOL_SIZE the index is rebuilt as HNSW or IVF. Vectors are
+    L2-normalised, so inner product equals cosine similarity.
+
+    HNSW cannot delete vectors, so removed HNSW entries are tombstoned:
+    searches skip them, and the index is rebuilt once tombstones exceed
+    TOMBSTONE_REBUILD_RATIO of the pool.
+
+    IVF centroids are trained on the pool at build time, with at least
+    IVF_MIN_POINTS_PER_CENTROID vectors per list, and retrained once the
+    pool has grown IVF_RETRAIN_GROWTH times past the trained size.
+    """
+
+    TOMBSTONE_REBUILD_RATIO = 0.2
+    # faiss warns and produces degenerate lists below 39 training points per centroid
+    IVF_MIN_POINTS_PER_CENTROID = 39
+    IVF_RETRAIN_GROWTH = 2.0
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        self._lock = threading.RLock()
+        self._index = None
+        self._kind = "flat"
+        self._dimension: Optional[int] = None
+        self._next_id = 0
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        self._ids_by_hash: Dict[str, int] = {}
+        # Ids removed from the pool but still present in an HNSW index
+        self._tombstones: Set[int] = set()
+        # Pool size the IVF centroids were trained on
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def add(self, content_hash: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
+        """Add a resume to the pool, replacing any previous entry for the same hash."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            if self._dimension is None:
+                self._dimension = vector.shape[0]
+            elif vector.shape[0] != self._dimension:
+                raise ValueError(f"Embedding dimension {vector.shape[0]} != index dimension {self._dimension}")
+
+            if content_hash in self._ids_by_hash:
+                self.remove(content_hash)
+
+            candidate_id = self._next_id
+            self._next_id += 1
+            self._vectors[candidate_id] = vector
+            self._metadata[candidate_id] = {**metadata, "content_hash": content_hash}
+            self._ids_by_hash[content_hash] = candidate_id
+
+            if self._index is None or self._kind != self._target_kind() or self._needs_retraining():
+                self._rebuild()
+            else:
+                self._index.add_with_ids(vector[None, :], np.array([candidate_id], dtype=np.int64))
+
+    def remove(self, content_hash: str) -> bool:
+        """Remove a resume from the pool. Returns False if it was not indexed."""
+        with self._lock:
+            candidate_id = self._ids_by_hash.pop(content_hash, None)
+            if candidate_id is None:
+                return False
+            del self._vectors[candidate_id]
+            del self._metadata[candidate_id]
+
+            if self._kind != self._target_kind():
+                self._rebuild()
+            elif self._kind == "hnsw":
+                # HNSW does not support deletion; searches skip the id until the next rebuild
+                self._tombstones.add(candidate_id)
+            else:
+                self._index.remove_ids(np.array([candidate_id], dtype=np.int64))
+            return True
+
+    def contains(self, content_hash: str) -> bool:
+        return content_hash in self._ids_by_hash
+
+    def search(self, query: List[float], top_k: int = 10) -> List[Dict[str, Any]]:
+        """Return the `top_k` most similar candidates to `query`."""
+        with self._lock:
+            if not self._vectors or top_k < 1:
+                return []
+            if len(self._tombstones) > self.TOMBSTONE_REBUILD_RATIO * len(self._vectors):
+                self._rebuild()
+            vector = self._normalize(query)
+            # Over-fetch so tombstoned hits do not crowd out live candidates
+            k = min(top_k + len(self._tombstones), self._index.ntotal)
+            scores, ids = self._index.search(vector[None, :], k)
+
+            results = []
+            for score, candidate_id in zip(scores[0], ids[0]):
+                if candidate_id < 0 or candidate_id not in self._metadata:
+                    continue
+                results.append({**self._metadata[candidate_id], "similarity_score": round(float(score), 4)})
+            return results[:top_k]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "candidates": len(self._vectors),
+                "index_type": self._kind if self._index is not None else None,
+                "dimension": self._dimension,
+                "tombstones": len(self._tombstones),
+            }
+
+    def save(self) -> None:
+        """Write the FAISS index, vectors and metadata to INDEX_DIR."""
+        with self._lock:
+            os.makedirs(self.index_dir, exist_ok=True)
+            ids = sorted(self._vectors)
+            vectors = (
+                np.stack([self._vectors[i] for i in ids])
+                if ids else np.zeros((0, self._dimension or 0), dtype=np.float32)
+            )
+            np.save(os.path.join(self.index_dir, "vectors.npy"), vectors)
+            if self._index is not None:
+                faiss.write_index(self._index, os.path.join(self.index_dir, "index.faiss"))
+
+            meta = {
+                "kind": self._kind,
+                "dimension": self._dimension,
+                "next_id": self._next_id,
+                "trained_size": self._trained_size,
+                "ids": ids,
+                "metadata": [self._metadata[i] for i in ids],
+            }
+            tmp_path = os.path.join(self.index_dir, "meta.json.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, os.path.join(self.index_dir, "meta.json"))
+
+    def load(self) -> None:
+        """Reload a previously saved pool from INDEX_DIR, if there is one."""
+        meta_path = os.path.join(self.index_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return
+
+        with self._lock:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            vectors = np.load(os.path.join(self.index_dir, "vectors.npy"))
+
+            self._kind = meta["kind"]
+            self._dimension = meta["dimension"]
+            self._next_id = meta["next_id"]
+            self._vectors = {i: vectors[row] for row, i in enumerate(meta["ids"])}
+            self._metadata = dict(zip(meta["ids"], meta["metadata"]))
+            self._ids_by_hash = {m["content_hash"]: i for i, m in self._metadata.items()}
+            self._tombstones = set()
+            self._trained_size = meta.get("trained_size", len(self._vectors))
+
+            index_path = os.path.join(self.index_dir, "index.faiss")
+            try:
+                self._index = faiss.read_index(index_path)
+                self._configure(self._index)
+            except Exception as e:
+                logger.warning(f"Could not read FAISS index, rebuilding: {str(e)}")
+                self._index = None
+            if self._index is None or self._index.ntotal != len(self._vectors):
+                self._rebuild()
+            logger.info(f"Loaded candidate index with {len(self._vectors)} resumes")
+
+    def _target_kind(self) -> str:
+        if len(self._vectors) >= settings.INDEX_LARGE_POOL_SIZE:
+            return settings.INDEX_LARGE_TYPE
+        return "flat"
+
+    def _needs_retraining(self) -> bool:
+        return self._kind == "ivf" and len(self._vectors) >= self.IVF_RETRAIN_GROWTH * max(self._trained_size, 1)
+
+    def _rebuild(self) -> None:
+        """Rebuild the FAISS index from the stored vectors."""
+        self._kind = self._target_kind()
+        self._tombstones = set()
+        if self._dimension is None:
+            self._index = None
+            return
+
+        ids = np.array(sorted(self._vectors), dtype=np.int64)
+        vectors = (
+            np.stack([self._vectors[i] for i in ids])
+            if len(ids) else np.zeros((0, self._dimension), dtype=np.float32)
+        )
+
+        self._trained_size = len(ids)
+        if self._kind == "ivf":
+            nlist = max(1, min(int(4 * np.sqrt(len(ids))), len(ids) // self.IVF_MIN_POINTS_PER_CENTROID))
+            quantizer = faiss.IndexFlatIP(self._dimension)
+            index = faiss.IndexIVFFlat(quantizer, self._dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+            if nlist == 1:
+                # A single list needs no clustering (and faiss warns on small training sets)
+                centroid = vectors.mean(axis=0) if len(ids) else np.zeros(self._dimension, dtype=np.float32)
+                quantizer.add(centroid[None, :].astype(np.float32))
+                index.is_trained = True
+            else:
+                index.train(vectors)
+        elif self._kind == "hnsw":
+            index = faiss.IndexIDMap2(
+                faiss.IndexHNSWFlat(self._dimension, settings.INDEX_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            )
+        else:
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(self._dimension))
+
+        if len(ids):
+            index.add_with_ids(vectors, ids)
+        self._configure(index)
+        self._index = index
+
+    def _configure(self, index) -> None:
+        if self._kind == "ivf":
+            index.nprobe = settings.INDEX_IVF_NPROBE
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+candidate_index = CandidateIndex(settings.INDEX_DIR)
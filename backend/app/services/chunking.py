@@ -0,0 +1,88 @@
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+from app.core.config import settings
+
+# Common resume section headings, matched against a whole (short) line
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "professional summary", "objective", "about me", "career objective"],
+    "experience": ["experience", "work experience", "professional experience", "employment history",
+                   "work history", "employment", "internships", "internship"],
+    "education": ["education", "academic background", "qualifications", "academic qualifications"],
+    "skills": ["skills", "technical skills", "core skills", "key skills", "core competencies",
+               "competencies", "technologies", "tech stack", "tools", "tools & technologies"],
+    "projects": ["projects", "personal projects", "key projects", "academic projects"],
+    "certifications": ["certifications", "certificates", "licenses", "courses", "training"],
+    "publications": ["publications", "research"],
+    "awards": ["awards", "achievements", "honors", "honours", "accomplishments"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies"],
+}
+
+# Sections that carry skill evidence; used to trim the skill extraction prompt
+SKILL_SECTIONS = ("summary", "experience", "skills", "projects", "certifications")
+
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+@dataclass
+class Chunk:
+    section: str
+    text: str
+
+def _heading_of(line: str) -> str:
+    """Return the section a heading line starts, or "" for ordinary lines."""
+    candidate = re.sub(r"[^a-z& ]", "", line.strip().lower()).strip()
+    if not candidate or len(candidate) > 40:
+        return ""
+    return _HEADING_LOOKUP.get(candidate, "")
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split resume text into (section, body) pairs in document order.
+
+    Text before the first recognised heading goes into a "header" section.
+    """
+    sections: List[Tuple[str, List[str]]] = [("header", [])]
+    for line in text.splitlines():
+        section = _heading_of(line)
+        if section:
+            sections.append((section, []))
+        else:
+            sections[-1][1].append(line)
+    return [(name, "\n".join(lines).strip()) for name, lines in sections if "\n".join(lines).strip()]
+
+def chunk_text(text: str, chunk_chars: int, overlap: int) -> List[str]:
+    """Split text into chunks of about `chunk_chars`, breaking on line boundaries."""
+    chunks = []
+    current = ""
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        # Hard-split lines longer than a whole chunk
+        step = max(1, chunk_chars - overlap)
+        while len(line) > chunk_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:chunk_chars])
+            line = line[step:]
+        if current and len(current) + len(line) + 1 > chunk_chars:
+            chunks.append(current)
+            current = current[-overlap:] if overlap else ""
+        current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
+def chunk_resume(text: str) -> List[Chunk]:
+    """Section-aware chunks of a resume; chunks never span two sections."""
+    return [
+        Chunk(section=section, text=piece)
+        for section, body in split_sections(text)
+        for piece in chunk_text(body, settings.CHUNK_CHARS, settings.CHUNK_OVERLAP)
+    ]
+
+def skill_context(text: str) -> str:
+    """The skill-bearing sections of a resume, or the whole text if none were found."""
+    bodies = [body for section, body in split_sections(text) if section in SKILL_SECTIONS]
+    return "\n\n".join(bodies) if bodies else text
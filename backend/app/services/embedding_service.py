@@ -1,14 +1,60 @@
+from typing import List, Optional
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from app.core.config import settings
+from app.services.cache_service import resume_cache
+from app.utils.metrics import timed
 
 class EmbeddingService:
     def __init__(self):
         self.embeddings = GoogleGenerativeAIEmbeddings(
             model=settings.EMBEDDING_MODEL,
-            google_api_key=settings.GOOGLE_API_KEY
+            google_api_key=settings.GOOGLE_API_KEY,
+            base_url=settings.GEMINI_BASE_URL or None
         )
     
     def embed_query(self, text: str) -> list:
-        return self.embeddings.embed_query(text)
+        with timed("embed_query"):
+            return self.embeddings.embed_query(text)
 
-embedding_service = EmbeddingService()
\ No newline at end of file
+    def embed_batch(self, texts: List[str]) -> List[list]:
+        """Embed many texts using the provider's batch endpoint.
+
+        Texts are sent in chunks of EMBEDDING_BATCH_SIZE and embedded with the
+        same task type as embed_query, so vectors from both paths are comparable.
+        """
+        batch_size = max(1, settings.EMBEDDING_BATCH_SIZE)
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            with timed("embed_batch"):
+                vectors.extend(self.embeddings.embed_documents(
+                    chunk,
+                    batch_size=len(chunk),
+                    task_type="retrieval_query"
+                ))
+        return vectors
+
+    def embed_resumes(self, documents) -> List[Optional[list]]:
+        """Embed parsed resumes, serving cached vectors and batching the rest.
+
+        Returns one embedding per document (None for documents without text).
+        """
+        vectors: List[Optional[list]] = [None] * len(documents)
+        pending = []
+        for i, document in enumerate(documents):
+            if not document.text.strip():
+                continue
+            cached = resume_cache.get(document.content_hash, "embedding")
+            if cached is not None:
+                vectors[i] = cached
+            else:
+                pending.append(i)
+
+        if pending:
+            embedded = self.embed_batch([documents[i].text for i in pending])
+            for i, vector in zip(pending, embedded):
+                vectors[i] = vector
+                resume_cache.set(documents[i].content_hash, "embedding", vector)
+        return vectors
+
+embedding_service = EmbeddingService()
@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.services.ranking_store import order_ranking
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (job_description, filename, pdf_bytes) -> ranked row, or None to skip the file
+CandidateProcessor = Callable[[str, str, bytes], Awaitable[Optional[Dict[str, Any]]]]
+
+class JobQueue:
+    """Durable batch-ranking jobs backed by SQLite and served by a worker pool.
+
+    Every uploaded resume is stored as a pending candidate row. Workers pull
+    candidates from an in-process queue, store each result as soon as it is
+    ready and drop the PDF bytes. On start, pending candidates of unfinished
+    jobs are queued again, so jobs resume after a restart.
+    """
+
+    def __init__(self, db_path: str, worker_count: int, process_candidate: CandidateProcessor):
+        self.db_path = db_path
+        self.worker_count = max(1, worker_count)
+        self.process_candidate = process_candidate
+        self._lock = threading.Lock()
+        self._db = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self._connect)
+        self._queue = asyncio.Queue()
+        for job_id, position in await asyncio.to_thread(self._pending_candidates):
+            self._queue.put_nowait((job_id, position))
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        logger.info(f"Job queue started with {self.worker_count} workers, {self._queue.qsize()} pending candidates")
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, job_description: str, files: List[Tuple[str, bytes]]) -> str:
+        """Store a new job and queue all of its candidates. Returns the job id."""
+        job_id = str(uuid.uuid4())
+        await asyncio.to_thread(self._insert_job, job_id, job_description, files)
+        for position in range(len(files)):
+            self._queue.put_nowait((job_id, position))
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._job_status, job_id)
+
+    async def cancel(self, job_id: str) -> bool:
+        return await asyncio.to_thread(self._cancel_job, job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, position = await self._queue.get()
+            try:
+                await self._process(job_id, position)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id} candidate {position} failed: {str(e)}")
+                await asyncio.to_thread(self._store_result, job_id, position, "failed", None)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job_id: str, position: int) -> None:
+        candidate = await asyncio.to_thread(self._load_candidate, job_id, position)
+        if candidate is None:
+            # Already processed, or the job was cancelled
+            return
+        job_description, filename, pdf_bytes = candidate
+        row = await self.process_candidate(job_description, filename, pdf_bytes)
+        status = "done" if row is not None else "skipped"
+        await asyncio.to_thread(self._store_result, job_id, position, status, row)
+
+    # SQLite access (runs in worker threads)
+
+    def _connect(self) -> None:
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, job_description TEXT NOT NULL, "
+            "total INTEGER NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS job_candidates ("
+            "job_id TEXT NOT NULL, position INTEGER NOT NULL, filename TEXT, pdf BLOB, "
+            "status TEXT NOT NULL, result TEXT, PRIMARY KEY (job_id, position));"
+        )
+        self._db.commit()
+
+    def _pending_candidates(self) -> List[Tuple[str, int]]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT c.job_id, c.position FROM job_candidates c JOIN jobs j ON j.job_id = c.job_id "
+                "WHERE c.status = 'pending' AND j.status IN ('queued', 'running') "
+                "ORDER BY j.created_at, c.position"
+            ).fetchall()
+
+    def _insert_job(self, job_id: str, job_description: str, files: List[Tuple[str, bytes]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (job_id, status, job_description, total, created_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, job_description, len(files), now, now)
+            )
+            self._db.executemany(
+                "INSERT INTO job_candidates (job_id, position, filename, pdf, status) VALUES (?, ?, ?, ?, 'pending')",
+                [(job_id, i, filename, pdf_bytes) for i, (filename, pdf_bytes) in enumerate(files)]
+            )
+            self._db.commit()
+
+    def _load_candidate(self, job_id: str, position: int) -> Optional[Tuple[str, str, bytes]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT j.job_description, j.status, c.filename, c.pdf, c.status "
+                "FROM job_candidates c JOIN jobs j ON j.job_id = c.job_id "
+                "WHERE c.job_id = ? AND c.position = ?",
+                (job_id, position)
+            ).fetchone()
+            if row is None:
+                return None
+            job_description, job_status, filename, pdf_bytes, status = row
+            if status != "pending" or job_status not in ("queued", "running"):
+                return None
+            if job_status == "queued":
+                self._db.execute(
+                    "UPDATE jobs SET status = 'running', updated_at = ? WHERE job_id = ?",
+                    (time.time(), job_id)
+                )
+                self._db.commit()
+            return job_description, filename, pdf_bytes
+
+    def _store_result(self, job_id: str, position: int, status: str, row: Optional[Dict[str, Any]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE job_candidates SET status = ?, result = ?, pdf = NULL WHERE job_id = ? AND position = ?",
+                (status, json.dumps(row) if row is not None else None, job_id, position)
+            )
+            remaining = self._db.execute(
+                "SELECT COUNT(*) FROM job_candidates WHERE job_id = ? AND status = 'pending'",
+                (job_id,)
+            ).fetchone()[0]
+            if remaining == 0:
+                self._db.execute(
+                    "UPDATE jobs SET status = 'completed', updated_at = ? WHERE job_id = ? AND status = 'running'",
+                    (now, job_id)
+                )
+            else:
+                self._db.execute("UPDATE jobs SET updated_at = ? WHERE job_id = ?", (now, job_id))
+            self._db.commit()
+
+    def _cancel_job(self, job_id: str) -> bool:
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = 'cancelled', updated_at = ? "
+                "WHERE job_id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id)
+            )
+            self._db.execute(
+                "UPDATE job_candidates SET pdf = NULL WHERE job_id = ? AND status = 'pending'",
+                (job_id,)
+            )
+            self._db.commit()
+            return cursor.rowcount > 0
+
+    def _job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._db.execute(
+                "SELECT status, total, created_at, updated_at FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            candidates = self._db.execute(
+                "SELECT status, result FROM job_candidates WHERE job_id = ? ORDER BY position",
+                (job_id,)
+            ).fetchall()
+
+        status, total, created_at, updated_at = job
+        # Same order as /rank-resumes for the same inputs
+        results = order_ranking([json.loads(result) for _, result in candidates if result is not None])
+        return {
+            "job_id": job_id,
+            "status": status,
+            "total": total,
+            "processed": sum(1 for candidate_status, _ in candidates if candidate_status != "pending"),
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "results": results,
+        }
@@ -0,0 +1,54 @@
+import re
+from collections import Counter
+from typing import List
+import numpy as np
+
+# Very common words that carry no signal when matching resumes against a JD
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "our", "that", "the", "their", "this", "to", "we", "will",
+    "with", "you", "your", "who", "what", "which", "can", "all", "any", "able", "work",
+    "experience", "years", "year", "strong", "team", "skills", "knowledge", "ability",
+}
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, keeping skill-like tokens such as c++, c# and node.js."""
+    tokens = re.findall(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*", text.lower())
+    return [token for token in tokens if token not in STOPWORDS and (len(token) > 1 or token in ("c", "r"))]
+
+def bm25_scores(documents: List[str], query: str, k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """Okapi BM25 score of every document against `query`, scaled to [0, 1].
+
+    Only the query's vocabulary matters, so term frequencies are kept in a
+    dense (documents x query terms) float32 matrix and scored with one
+    matrix-vector product.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not documents or not terms:
+        return np.zeros(len(documents), dtype=np.float32)
+
+    column = {term: j for j, term in enumerate(terms)}
+    tf = np.zeros((len(documents), len(terms)), dtype=np.float32)
+    lengths = np.zeros(len(documents), dtype=np.float32)
+    for i, document in enumerate(documents):
+        tokens = tokenize(document)
+        lengths[i] = len(tokens)
+        for term, count in Counter(tokens).items():
+            j = column.get(term)
+            if j is not None:
+                tf[i, j] = count
+
+    n = len(documents)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+    avg_length = lengths.mean() or 1.0
+    norm = k1 * (1 - b + b * lengths / avg_length)
+    scores = ((tf * (k1 + 1)) / (tf + norm[:, None])) @ idf
+
+    top = scores.max()
+    return scores / top if top > 0 else scores
+
+def top_k_indices(scores: np.ndarray, k: int) -> List[int]:
+    """Indices of the `k` best scores, in their original order (ties keep the earlier item)."""
+    order = np.argsort(-scores, kind="stable")[:k]
+    return sorted(int(i) for i in order)
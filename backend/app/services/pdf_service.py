@@ -1,59 +1,97 @@
-import os
-import tempfile
+import io
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 from pypdf import PdfReader
 import magic
 import logging
+from app.services.cache_service import content_hash, resume_cache, resume_registry
+from app.utils.metrics import timed
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def is_valid_pdf(file_bytes: bytes) -> bool:
-    """Check if the file is a valid PDF"""
-    try:
-        # Check if file is empty
-        if len(file_bytes) == 0:
-            return False
-            
-        # Check file type using magic
-        file_type = magic.from_buffer(file_bytes)
-        if "PDF" not in file_type:
-            return False
-            
-        # Try to read the PDF
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp.write(file_bytes)
-            tmp_path = tmp.name
-        
+@dataclass
+class ResumeDocument:
+    """A resume PDF parsed once and shared by every step of a request."""
+    content_hash: str
+    page_count: int
+    pages: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "".join(page + "\n" for page in self.pages)
+
+def load_resume_document(file_bytes: bytes) -> Optional[ResumeDocument]:
+    """Parse PDF bytes in memory. Returns None if the file is not a valid PDF."""
+    # Check if file is empty
+    if len(file_bytes) == 0:
+        return None
+
+    # Resumes seen before are served from the content-addressed cache
+    digest = content_hash(file_bytes)
+    cached = resume_cache.get(digest, "document")
+    if cached is not None:
+        return ResumeDocument(
+            content_hash=digest,
+            page_count=cached["page_count"],
+            pages=cached["pages"]
+        )
+
+    with timed("pdf_parse"):
         try:
-            reader = PdfReader(tmp_path)
+            # Check file type using magic
+            file_type = magic.from_buffer(file_bytes)
+            if "PDF" not in file_type:
+                return None
+
+            reader = PdfReader(io.BytesIO(file_bytes))
             if len(reader.pages) == 0:
-                return False
-            return True
-        except:
-            return False
-        finally:
-            os.unlink(tmp_path)
-    except:
-        return False
+                return None
+        except Exception:
+            return None
+
+        pages = []
+        try:
+            for page in reader.pages:
+                pages.append(page.extract_text() or "")
+        except Exception as e:
+            logger.error(f"PDF extraction error: {str(e)}")
+            pages = []
+
+    document = ResumeDocument(
+        content_hash=digest,
+        page_count=len(reader.pages),
+        pages=pages
+    )
+    if pages:
+        resume_cache.set(digest, "document", {"page_count": document.page_count, "pages": pages})
+    return document
+
+def register_resume_document(document: ResumeDocument, filename: str, name: str) -> None:
+    """Keep a parsed resume in the registry so later requests can refer to it by hash."""
+    resume_registry.set(document.content_hash, "document", {"page_count": document.page_count, "pages": document.pages})
+    resume_registry.set(document.content_hash, "filename", filename)
+    resume_registry.set(document.content_hash, "name", name)
+
+def get_registered_document(resume_id: str) -> Optional[Tuple[str, ResumeDocument]]:
+    """(filename, document) of a registered resume, or None for an unknown id."""
+    stored = resume_registry.get(resume_id, "document")
+    if stored is None:
+        return None
+    document = ResumeDocument(content_hash=resume_id, page_count=stored["page_count"], pages=stored["pages"])
+    return resume_registry.get(resume_id, "filename") or f"{resume_id[:12]}.pdf", document
+
+def get_registered_name(resume_id: str) -> str:
+    """Candidate name stored when the resume was registered."""
+    return resume_registry.get(resume_id, "name") or "Unknown Candidate"
+
+def is_valid_pdf(file_bytes: bytes) -> bool:
+    """Check if the file is a valid PDF"""
+    return load_resume_document(file_bytes) is not None
 
 def extract_text_from_pdf(file_bytes: bytes) -> str:
     """Extract text from PDF bytes."""
-    # First check if it's a valid PDF
-    if not is_valid_pdf(file_bytes):
-        return ""
-    
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        tmp.write(file_bytes)
-        tmp_path = tmp.name
-    
-    text = ""
-    try:
-        reader = PdfReader(tmp_path)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-    except Exception as e:
-        logger.error(f"PDF extraction error: {str(e)}")
+    document = load_resume_document(file_bytes)
+    if document is None:
         return ""
-    finally:
-        os.unlink(tmp_path)
-    return text
\ No newline at end of file
+    return document.text
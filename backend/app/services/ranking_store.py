@@ -0,0 +1,111 @@
+import uuid
+from typing import Any, Dict, List, Optional
+import numpy as np
+from app.agents.skill_matcher import normalize_skill
+from app.agents.trust_score import trust_score_matrix, weighted_coverage
+from app.services.cache_service import candidate_cache, ranking_cache
+
+# Marker that rank_candidate puts in the skill lists of rows it failed to score
+PROCESSING_ERROR = "Processing Error"
+
+def order_ranking(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fully scored candidates by trust score, then prefiltered ones by lexical score."""
+    return sorted(
+        results,
+        key=lambda x: (not x.get("prefiltered", False), x["trust_score"], x.get("lexical_score") or 0.0),
+        reverse=True
+    )
+
+def store_ranking(required_skills: List[str], rows: List[Dict[str, Any]]) -> str:
+    """Keep a ranking's per-candidate features and return its ranking id.
+
+    Features are each candidate's similarity score and a (candidates x
+    required skills) incidence matrix of covered skills, derived from the
+    rows' missing skills. Rows that failed to score cover nothing.
+    """
+    required = list(dict.fromkeys(required_skills))
+    similarity = []
+    covered = []
+    for row in rows:
+        # Rows carry a rounded score; the stored graph state has the exact one
+        state = candidate_cache.get(row["candidate_id"], "state")
+        similarity.append(state["similarity_score"] if state else row["similarity_score"])
+        missing = set(row["missing_skills"])
+        failed = PROCESSING_ERROR in missing
+        covered.append([0 if failed or skill in missing else 1 for skill in required])
+
+    ranking_id = str(uuid.uuid4())
+    ranking_cache.set(ranking_id, "features", {
+        "required_skills": required,
+        "similarity": similarity,
+        "covered": covered,
+        "rows": rows,
+    })
+    return ranking_id
+
+def rescore_ranking(
+    ranking_id: str,
+    similarity_weight: float,
+    skill_weights: Dict[str, float],
+    must_have_skills: List[str]
+) -> Optional[List[Dict[str, Any]]]:
+    """Recompute trust scores of a stored ranking under new weights.
+
+    `skill_weights` maps required skills to weights (default 1.0); a
+    candidate's coverage is the covered share of the total weight.
+    Candidates missing any must-have skill are flagged and ranked after
+    those who have them all. Returns None for an unknown ranking id and
+    raises ValueError for skills that are not required by the ranking's JD,
+    negative or all-zero weights, and weights given twice for one skill
+    under different spellings.
+    """
+    features = ranking_cache.get(ranking_id, "features")
+    if features is None:
+        return None
+
+    required = features["required_skills"]
+    column = {normalize_skill(skill): j for j, skill in enumerate(required)}
+    unknown = [
+        skill for skill in [*skill_weights, *must_have_skills]
+        if normalize_skill(skill) not in column
+    ]
+    if unknown:
+        raise ValueError(f"Skills not required by this ranking: {', '.join(unknown)}")
+
+    weighted: Dict[str, str] = {}
+    for skill in skill_weights:
+        key = normalize_skill(skill)
+        if key in weighted:
+            raise ValueError(f"Conflicting weights for the same skill: {weighted[key]}, {skill}")
+        weighted[key] = skill
+    if any(weight < 0 for weight in skill_weights.values()):
+        raise ValueError("Skill weights must not be negative")
+
+    weights = np.ones(len(required), dtype=np.float64)
+    for skill, weight in skill_weights.items():
+        weights[column[normalize_skill(skill)]] = weight
+    if len(required) and not weights.any():
+        raise ValueError("At least one skill weight must be positive")
+    must_have = [column[normalize_skill(skill)] for skill in must_have_skills]
+
+    covered = np.asarray(features["covered"], dtype=np.float64).reshape(-1, len(required))
+    similarity = np.asarray(features["similarity"], dtype=np.float64)
+    trust = trust_score_matrix(similarity, weighted_coverage(covered, weights), similarity_weight)
+    eligible = covered[:, must_have].all(axis=1) if must_have else np.ones(len(similarity), dtype=bool)
+
+    rows = []
+    for i, row in enumerate(features["rows"]):
+        prefiltered = row.get("prefiltered", False)
+        rows.append({
+            **row,
+            # Prefiltered candidates were never scored; they keep their lexical ranking
+            "trust_score": row["trust_score"] if prefiltered else float(trust[i]),
+            "meets_must_haves": bool(eligible[i]),
+        })
+    return sorted(
+        rows,
+        key=lambda x: (
+            not x.get("prefiltered", False), x["meets_must_haves"], x["trust_score"], x.get("lexical_score") or 0.0
+        ),
+        reverse=True
+    )
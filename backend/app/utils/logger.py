@@ -0,0 +1,60 @@
+import json
+import time
+import logging
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# Per-request context: set by the request middleware, read by instrumentation.
+# Holds the request id, the ASGI scope (for the matched route) and the
+# (stage, seconds) timings recorded while serving the request.
+request_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_context", default=None)
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message and any `fields` extra."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        context = request_context.get()
+        if context is not None:
+            entry["request_id"] = context["request_id"]
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def get_structured_logger(name: str) -> logging.Logger:
+    """Logger that writes JSON lines to stderr, independent of the root configuration."""
+    structured = logging.getLogger(name)
+    if not structured.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+        structured.addHandler(handler)
+        structured.setLevel(logging.INFO)
+        structured.propagate = False
+    return structured
+
+request_logger = get_structured_logger("ragcruit.requests")
+
+def new_request_context(request_id: str, scope: Dict[str, Any]) -> Dict[str, Any]:
+    return {"request_id": request_id, "scope": scope, "started": time.perf_counter(), "timings": []}
+
+def record_timing(stage: str, seconds: float) -> None:
+    """Add a stage timing to the current request's log entry, if there is one."""
+    context = request_context.get()
+    if context is not None:
+        # list.append is atomic, so threadpool and graph worker threads can share the list
+        context["timings"].append((stage, seconds))
+
+def summarize_timings(context: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Per-stage call count and total milliseconds for a request log entry."""
+    summary: Dict[str, Dict[str, float]] = {}
+    for stage, seconds in list(context["timings"]):
+        stats = summary.setdefault(stage, {"count": 0, "total_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] = round(stats["total_ms"] + seconds * 1000, 2)
+    return summary
@@ -0,0 +1,147 @@
+import time
+import functools
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from app.services.cache_service import candidate_cache, job_cache, ranking_cache, resume_cache, skill_cache
+from app.core.config import settings
+from app.utils.logger import record_timing, request_context
+from app.utils.profiling import profile_block
+
+# Latency buckets from a cached lookup (ms) to a slow LLM call (tens of seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUEST_DURATION = Histogram(
+    "ragcruit_request_duration_seconds",
+    "HTTP request duration until the response starts",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+NODE_DURATION = Histogram(
+    "ragcruit_node_duration_seconds",
+    "Duration of screening graph nodes",
+    ["node"],
+    buckets=LATENCY_BUCKETS
+)
+STAGE_DURATION = Histogram(
+    "ragcruit_stage_duration_seconds",
+    "Duration of pipeline stages (PDF parsing, skill extraction, embedding calls)",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_CALLS = Counter("ragcruit_llm_calls_total", "LLM calls started", ["model"])
+LLM_ERRORS = Counter("ragcruit_llm_errors_total", "LLM calls that raised", ["model"])
+LLM_TOKENS = Counter("ragcruit_llm_tokens_total", "LLM tokens reported by the provider", ["model", "kind"])
+IN_FLIGHT = Gauge("ragcruit_in_flight_candidates", "Candidates currently being scored", ["route"])
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Observe the duration of a block in the stage histogram and the request log.
+
+    Inside a profiled request the block is also captured by cProfile.
+    """
+    context = request_context.get()
+    start = time.perf_counter()
+    try:
+        if context is not None and "profile" in context:
+            with profile_block(context):
+                yield
+        else:
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.labels(stage).observe(elapsed)
+        record_timing(stage, elapsed)
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """Wrap a graph node so every run is timed under its node name."""
+    @functools.wraps(node)
+    def wrapper(state):
+        context = request_context.get()
+        start = time.perf_counter()
+        try:
+            if context is not None and "profile" in context:
+                with profile_block(context):
+                    return node(state)
+            return node(state)
+        finally:
+            elapsed = time.perf_counter() - start
+            NODE_DURATION.labels(name).observe(elapsed)
+            record_timing(f"node:{name}", elapsed)
+    return wrapper
+
+def current_route() -> str:
+    """Route template of the request being served ("background" outside requests)."""
+    context = request_context.get()
+    if context is None:
+        return "background"
+    route = context["scope"].get("route")
+    return getattr(route, "path", None) or context["scope"].get("path", "unknown")
+
+@contextmanager
+def in_flight() -> Iterator[None]:
+    """Count a candidate as in flight for the current route while the block runs."""
+    gauge = IN_FLIGHT.labels(current_route())
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Counts LLM calls, errors and token usage for every chat model it is attached to."""
+
+    def __init__(self, model: str):
+        self.model = model
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], **kwargs: Any) -> None:
+        LLM_CALLS.labels(self.model).inc()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+        LLM_CALLS.labels(self.model).inc()
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        LLM_ERRORS.labels(self.model).inc()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                if usage.get("input_tokens"):
+                    LLM_TOKENS.labels(self.model, "input").inc(usage["input_tokens"])
+                if usage.get("output_tokens"):
+                    LLM_TOKENS.labels(self.model, "output").inc(usage["output_tokens"])
+
+class CacheCollector:
+    """Exports the content caches' own hit/miss counters at scrape time (no hot-path cost)."""
+
+    caches = {
+        "resume": resume_cache,
+        "job": job_cache,
+        "candidate": candidate_cache,
+        "ranking": ranking_cache,
+        "skill": skill_cache,
+    }
+
+    def collect(self):
+        lookups = CounterMetricFamily(
+            "ragcruit_cache_lookups", "Content cache lookups", labels=["cache", "field", "result"]
+        )
+        entries = GaugeMetricFamily("ragcruit_cache_entries", "Entries held in memory", labels=["cache"])
+        for name, cache in self.caches.items():
+            stats = cache.stats()
+            for field, count in stats["hits_by_field"].items():
+                lookups.add_metric([name, field, "hit"], count)
+            for field, count in stats["misses_by_field"].items():
+                lookups.add_metric([name, field, "miss"], count)
+            entries.add_metric([name], stats["entries"])
+        yield lookups
+        yield entries
+
+REGISTRY.register(CacheCollector())
+
+# Shared by every chat model; attached through the `callbacks` constructor argument
+llm_metrics = LLMMetricsCallback(settings.LLM_MODEL)
@@ -0,0 +1,165 @@
+import io
+import os
+import sys
+import json
+import uuid
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set
+from app.utils.logger import summarize_timings
+
+# Routes that honour the profiling flag
+PROFILED_ROUTES = ("/screen-resume", "/rank-resumes")
+
+# From Python 3.12 cProfile runs on sys.monitoring, which allows a single
+# active profiler per interpreter; before that, one per thread
+_PROCESS_WIDE = sys.version_info >= (3, 12)
+_process_lock = threading.Lock()
+_active = threading.local()
+
+# Requests in flight, and the sessions currently profiling the event loop
+_requests_lock = threading.Lock()
+_in_flight = 0
+_loop_sessions: Set["ProfileSession"] = set()
+
+def _claim() -> bool:
+    """Reserve the profiler slot for the current thread (or the whole process on 3.12+)."""
+    if _PROCESS_WIDE:
+        return _process_lock.acquire(blocking=False)
+    if getattr(_active, "profiling", False):
+        return False
+    _active.profiling = True
+    return True
+
+def _release() -> None:
+    if _PROCESS_WIDE:
+        _process_lock.release()
+    else:
+        _active.profiling = False
+
+@contextmanager
+def track_request() -> Iterator[int]:
+    """Count the request as in flight; yields how many others already were.
+
+    Event-loop profiles open meanwhile are flagged as overlapping, since the
+    loop profiler also sees this request's coroutines.
+    """
+    global _in_flight
+    with _requests_lock:
+        others = _in_flight
+        _in_flight += 1
+        for session in _loop_sessions:
+            session.overlapping_requests += 1
+    try:
+        yield others
+    finally:
+        with _requests_lock:
+            _in_flight -= 1
+
+def profiling_requested(headers, query_params) -> bool:
+    """True when the request opts in with an `X-Profile: 1` header or `?profile=1`."""
+    flag = headers.get("x-profile") or query_params.get("profile") or ""
+    return flag.lower() in ("1", "true", "yes")
+
+class ProfileSession:
+    """cProfile capture of one request, merged across the threads that served it.
+
+    The event loop thread is profiled for the whole request; graph nodes and
+    instrumented stages running in worker threads are profiled block by
+    block. Blocks that cannot get a profiler (another profiled request holds
+    it, or on 3.12+ any profiler is already running) are skipped and only
+    show up in the stage timings. Profiling never fails the request.
+
+    The loop profiler cannot tell requests apart, so it is not started when
+    other requests are in flight, and requests arriving during it are counted
+    in `overlapping_requests`; a non-zero count means the event-loop part of
+    the profile includes other requests' work.
+    """
+
+    def __init__(self):
+        self.profile_id = str(uuid.uuid4())
+        self.event_loop_profiled = False
+        self.skipped_captures = 0
+        self.overlapping_requests = 0
+        self._lock = threading.Lock()
+        self._stats: Optional[pstats.Stats] = None
+
+    @contextmanager
+    def capture(self) -> Iterator[bool]:
+        """Profile the block; yields False if no profiler could be started for it."""
+        started = _claim()
+        if started:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiling tool (debugger, coverage) owns sys.monitoring
+                _release()
+                started = False
+        if not started:
+            with self._lock:
+                self.skipped_captures += 1
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            profiler.disable()
+            _release()
+            with self._lock:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profiler)
+                else:
+                    self._stats.add(profiler)
+
+    @contextmanager
+    def capture_event_loop(self, requests_in_flight: int) -> Iterator[None]:
+        """Profile the event loop for the block, unless other requests are in flight."""
+        if requests_in_flight:
+            self.overlapping_requests += requests_in_flight
+            yield
+            return
+        with _requests_lock:
+            _loop_sessions.add(self)
+        try:
+            with self.capture() as started:
+                self.event_loop_profiled = started
+                yield
+        finally:
+            with _requests_lock:
+                _loop_sessions.discard(self)
+
+    def save(self, directory: str, request_info: Dict[str, Any], context: Dict[str, Any]) -> None:
+        """Write <id>.prof (pstats, e.g. for snakeviz) and <id>.json (summary) to `directory`."""
+        os.makedirs(directory, exist_ok=True)
+        timings = summarize_timings(context)
+        summary = {
+            "profile_id": self.profile_id,
+            **request_info,
+            "event_loop_profiled": self.event_loop_profiled,
+            "skipped_captures": self.skipped_captures,
+            "overlapping_requests": self.overlapping_requests,
+            "nodes": {stage[5:]: stats for stage, stats in timings.items() if stage.startswith("node:")},
+            "stages": {stage: stats for stage, stats in timings.items() if not stage.startswith("node:")},
+        }
+        with self._lock:
+            if self._stats is not None:
+                self._stats.dump_stats(os.path.join(directory, f"{self.profile_id}.prof"))
+                report = io.StringIO()
+                self._stats.stream = report
+                self._stats.sort_stats("cumulative").print_stats(40)
+                summary["top_functions"] = report.getvalue()
+        with open(os.path.join(directory, f"{self.profile_id}.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+
+@contextmanager
+def profile_block(context: Optional[Dict[str, Any]]) -> Iterator[None]:
+    """Profile a worker-thread block when the current request is being profiled."""
+    session = context.get("profile") if context is not None else None
+    if session is None:
+        yield
+        return
+    with session.capture():
+        yield
@@ -0,0 +1,52 @@
+"""Compare two benchmarks.pipeline result files.
+
+Prints the throughput of every (stage, N) present in both files and the
+relative change. Exits with status 1 if any throughput dropped by more than
+--threshold, so it can gate a CI job.
+
+Usage (from backend/):
+    python -m benchmarks.compare benchmarks/results/<base>.json benchmarks/results/<head>.json
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+def load_results(path: str) -> Tuple[dict, Dict[Tuple[str, int], dict]]:
+    with open(path) as f:
+        report = json.load(f)
+    return report, {(result["stage"], result["n"]): result for result in report["results"]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative throughput drop")
+    args = parser.parse_args()
+
+    base_report, base = load_results(args.base)
+    head_report, head = load_results(args.head)
+    if base_report["config"] != head_report["config"]:
+        print("warning: the two runs used different configurations")
+        for key in sorted(set(base_report["config"]) | set(head_report["config"])):
+            if base_report["config"].get(key) != head_report["config"].get(key):
+                print(f"  {key}: {base_report['config'].get(key)} -> {head_report['config'].get(key)}")
+
+    print(f"base {base_report['git']['sha'][:12]}  {base_report['git']['subject']}")
+    print(f"head {head_report['git']['sha'][:12]}  {head_report['git']['subject']}")
+    print(f"{'stage':<14} {'N':>6} {'base/s':>10} {'head/s':>10} {'change':>8}")
+    regressions = 0
+    for key in sorted(set(base) & set(head), key=lambda key: (key[0], key[1])):
+        before = base[key]["throughput_per_s"]
+        after = head[key]["throughput_per_s"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change < -args.threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{key[0]:<14} {key[1]:>6} {before:>10.1f} {after:>10.1f} {change:>+8.1%}{flag}")
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
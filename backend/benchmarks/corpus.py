@@ -0,0 +1,141 @@
+"""Synthetic resume PDFs for offline benchmarks.
+
+Resumes are built from a seeded RNG, so a (seed, index) pair always yields
+the same bytes, and written as plain single-font PDFs with one text stream
+per page. Sizes cycle through `SIZES` so a corpus mixes one-page resumes
+(few skills, which sends them down the LLM skill-extraction path) with
+longer multi-page ones.
+"""
+import random
+from dataclasses import dataclass
+from typing import Iterator, List
+from app.agents.skill_taxonomy import AMBIGUOUS_SKILLS, SKILL_TAXONOMY
+
+@dataclass(frozen=True)
+class ResumeSize:
+    name: str
+    pages: int
+    skills: int
+    roles: int
+
+SIZES = (
+    ResumeSize("short", pages=1, skills=3, roles=1),
+    ResumeSize("medium", pages=2, skills=8, roles=3),
+    ResumeSize("long", pages=4, skills=14, roles=6),
+)
+
+FIRST_NAMES = ["Amira", "Bilal", "Chen", "Dana", "Elif", "Farah", "Goran", "Hina", "Ivan", "Jonas", "Keiko", "Luis"]
+LAST_NAMES = ["Ahmed", "Baker", "Costa", "Dubois", "Evans", "Fischer", "Garcia", "Haddad", "Ito", "Jensen", "Khan", "Lopez"]
+TITLES = ["Software Engineer", "Data Engineer", "Backend Developer", "ML Engineer", "Platform Engineer", "Analyst"]
+VERBS = ["Built", "Designed", "Maintained", "Migrated", "Optimised", "Led the rollout of", "Automated", "Scaled"]
+OBJECTS = [
+    "a reporting pipeline", "the billing service", "internal dashboards", "a recommendation API",
+    "the CI/CD workflow", "customer onboarding flows", "an event ingestion layer", "the search backend"
+]
+OUTCOMES = [
+    "cutting latency by 40%", "serving 2M requests a day", "for a team of 12 engineers",
+    "reducing cloud spend by a third", "with zero downtime", "ahead of the quarterly release"
+]
+
+JOB_DESCRIPTION = (
+    "We are hiring a Senior Backend Engineer to build and scale our data platform. "
+    "Required: Python, SQL, Docker, Kubernetes, AWS and experience with REST APIs. "
+    "Nice to have: Kafka, Terraform, React and machine learning pipelines. "
+    "You have 5+ years of professional experience and enjoy mentoring others."
+)
+
+LINES_PER_PAGE = 48
+LINE_HEIGHT = 14
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _wrap(text: str, width: int = 90) -> List[str]:
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    if current:
+        lines.append(current)
+    return lines
+
+def resume_lines(rng: random.Random, size: ResumeSize) -> List[str]:
+    """The text lines of one synthetic resume, padded to fill `size.pages` pages."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    # Ambiguous names ("Go", "Excel") are only matched in context, so leave them out
+    skills = rng.sample(sorted(set(SKILL_TAXONOMY) - AMBIGUOUS_SKILLS), size.skills)
+    years = rng.randint(1, 15)
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{name.split()[1].lower()}@example.com | +1 555 {rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        *_wrap(f"{rng.choice(TITLES)} with {years} years of experience shipping production systems."),
+        "",
+        "Skills",
+        *_wrap(", ".join(skills)),
+        "",
+        "Experience",
+    ]
+    for role in range(size.roles):
+        lines.append(f"{rng.choice(TITLES)}, Company {rng.randint(1, 500)} ({2024 - 2 * role - 2} - {2024 - 2 * role})")
+        for _ in range(4):
+            used = rng.choice(skills)
+            lines.extend(_wrap(
+                f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {used}, {rng.choice(OUTCOMES)}."
+            ))
+        lines.append("")
+    lines.extend(["Education", f"B.Sc. Computer Science, University {rng.randint(1, 90)}"])
+
+    # Filler projects bring the resume up to its page count
+    while len(lines) < LINES_PER_PAGE * (size.pages - 1) + LINES_PER_PAGE // 2:
+        lines.extend(_wrap(
+            f"Project: {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}."
+        ))
+    return lines
+
+def render_pdf(lines: List[str]) -> bytes:
+    """A minimal PDF with Helvetica text, LINES_PER_PAGE lines per page."""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages))), len(pages)
+        ),
+    ]
+    for i, page in enumerate(pages):
+        content = f"BT /F1 10 Tf 50 770 Td {LINE_HEIGHT} TL " + " ".join(
+            f"({_escape(line)}) Tj T*" for line in page
+        ) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def synthetic_resume(seed: int, index: int) -> bytes:
+    """The `index`-th resume of corpus `seed`."""
+    rng = random.Random(f"{seed}:{index}")
+    return render_pdf(resume_lines(rng, SIZES[index % len(SIZES)]))
+
+def synthetic_corpus(count: int, seed: int = 0) -> Iterator[bytes]:
+    """`count` distinct resumes. Different seeds never share content, so caches start cold."""
+    for index in range(count):
+        yield synthetic_resume(seed, index)
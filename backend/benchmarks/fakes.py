@@ -0,0 +1,146 @@
+"""Deterministic stand-ins for the Gemini chat and embedding models.
+
+The fakes answer the prompts the app actually sends (comma-separated skills,
+the structured resume profile, the career-coach feedback) from the prompt
+text alone, so the same input always produces the same output. Each call
+sleeps for a configurable latency to stand in for the network round trip:
+`time.sleep` on the sync path, `asyncio.sleep` on the async path, matching
+how the real clients block.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import Any, List, Optional
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from app.agents.skill_taxonomy import match_skills
+
+EMBEDDING_DIM = 768
+
+def _latency(base_ms: float, jitter_ms: float, key: str) -> float:
+    """Seconds to wait for `key`: base plus a jitter derived from the key's hash."""
+    if jitter_ms <= 0:
+        return base_ms / 1000
+    fraction = int.from_bytes(hashlib.sha256(key.encode()).digest()[:4], "big") / 2 ** 32
+    return (base_ms + jitter_ms * fraction) / 1000
+
+# Opening instruction of each prompt template the app sends. Prompts embed
+# resume and JD text, so they are told apart by how they start, not by
+# phrases anywhere in the body.
+FEEDBACK_PROMPT = "As a professional career coach"
+PROFILE_PROMPT = "Extract the candidate's full name"
+SKILLS_PROMPTS = ("Extract technical skills", "Extract required technical skills")
+
+def fake_reply(prompt: str) -> str:
+    """The fake model's answer to one of the app's prompts."""
+    prompt = prompt.lstrip()
+    if prompt.startswith(FEEDBACK_PROMPT):
+        return _feedback_reply(prompt)
+    if prompt.startswith(PROFILE_PROMPT):
+        header, _, text = prompt.partition("Resume Header:")[-1].partition("Resume Text:")
+        text = text.strip()
+        first_line = (header.strip() or text).split("\n", 1)[0].strip()
+        years = re.search(r"(\d+)\+? years", text)
+        return json.dumps({
+            "name": first_line or "Unknown Candidate",
+            "skills": match_skills(text),
+            "years_experience": float(years.group(1)) if years else None
+        })
+    if prompt.startswith(SKILLS_PROMPTS):
+        # Skill extraction: the taxonomy matches stand in for the model's answer
+        text = prompt.split("\n\n", 1)[-1]
+        return ", ".join(match_skills(text))
+    return _feedback_reply(prompt)
+
+def _feedback_reply(prompt: str) -> str:
+    missing = re.search(r"missing skills: (.*?)\. Match", prompt)
+    gaps = missing.group(1) if missing and missing.group(1) else "none"
+    return (
+        "Strengths: the resume covers most of the listed requirements.\n"
+        f"Gaps: {gaps}.\n"
+        "Suggestions: quantify impact in each role and move the skills section to the top."
+    )
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers RAGcruit's prompts without calling Gemini."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-gemini"
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        reply = fake_reply(prompt)
+        message = AIMessage(
+            content=reply,
+            usage_metadata={
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": len(reply) // 4,
+                "total_tokens": (len(prompt) + len(reply)) // 4
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(_latency(self.latency_ms, self.jitter_ms, str(messages[-1].content)))
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(_latency(self.latency_ms, self.jitter_ms, str(messages[-1].content)))
+        return self._result(messages)
+
+def fake_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """Hashed bag-of-words vector: texts sharing words get similar embeddings."""
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in re.findall(r"\w+", text.lower()):
+        vector[int.from_bytes(hashlib.md5(word.encode()).digest()[:4], "big") % dim] += 1.0
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        vector[0] = 1.0
+        norm = 1.0
+    return (vector / norm).tolist()
+
+class FakeEmbeddings(Embeddings):
+    """Embeddings client returning fake_embedding vectors."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, dim: int = EMBEDDING_DIM):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.dim = dim
+
+    def embed_documents(self, texts: List[str], **kwargs: Any) -> List[List[float]]:
+        # One round trip per batch request, like the provider's batch endpoint
+        time.sleep(_latency(self.latency_ms, self.jitter_ms, texts[0] if texts else ""))
+        return [fake_embedding(text, self.dim) for text in texts]
+
+    def embed_query(self, text: str, **kwargs: Any) -> List[float]:
+        time.sleep(_latency(self.latency_ms, self.jitter_ms, text))
+        return fake_embedding(text, self.dim)
+
+def install_fakes(
+    llm_latency_ms: float = 0.0,
+    embed_latency_ms: float = 0.0,
+    jitter_ms: float = 0.0
+) -> None:
+    """Replace every module-level Gemini client with a fake.
+
+    Must run before the first request; the compiled graphs look the models
+    up at call time, so already-imported modules pick the fakes up too.
+    """
+    import app.agents.resume_agent as resume_agent
+    import app.agents.resume_profile as resume_profile
+    import app.agents.skill_extractor as skill_extractor
+    from app.services.embedding_service import embedding_service
+    from app.utils.metrics import llm_metrics
+
+    for module in (resume_agent, resume_profile, skill_extractor):
+        module.llm = FakeChatModel(latency_ms=llm_latency_ms, jitter_ms=jitter_ms, callbacks=[llm_metrics])
+    embedding_service.embeddings = FakeEmbeddings(latency_ms=embed_latency_ms, jitter_ms=jitter_ms)
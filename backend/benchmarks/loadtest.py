@@ -0,0 +1,299 @@
+"""HTTP load test of the running app against the mock Gemini server.
+
+`--concurrency` simulated recruiters loop over a weighted mix of
+/screen-resume, /extract-name and /rank-resumes with synthetic resumes
+until `--duration` seconds (or `--requests` requests) have passed. In
+parallel a probe polls GET /cache/stats, which does no work: its latency
+rising under load means the event loop is blocked by synchronous code.
+
+The report gives per-endpoint and overall p50/p95/p99 latency, throughput
+and error rates (by status code), the probe latencies and, when the mock
+was spawned here, the 429s and 500s it injected. Results are written as
+JSON keyed by the git commit (benchmarks/results/loadtest-<sha>.json).
+
+With --spawn the mock server and the app (uvicorn, on throwaway data
+paths) are started here and stopped afterwards; the fault options are
+forwarded to the mock. Without it, --app-url must point at an app started
+with GEMINI_BASE_URL set to a running benchmarks.mock_gemini.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --spawn --concurrency 16 --duration 60 --rate-limit-rate 0.05
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+import httpx
+import numpy as np
+from benchmarks.corpus import JOB_DESCRIPTION, synthetic_resume
+from benchmarks.mock_gemini import FAULT_OPTIONS, add_fault_arguments
+from benchmarks.reporting import write_report
+
+ENDPOINTS = ("screen-resume", "extract-name", "rank-resumes")
+PROBE_PATH = "/cache/stats"
+
+@dataclass
+class Sample:
+    endpoint: str
+    latency: float
+    status: int
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+class ResumePool:
+    """Synthetic resumes to upload; size 0 makes every upload a new resume (cold caches)."""
+
+    def __init__(self, size: int, seed: int):
+        self.size = size
+        self.seed = seed
+        self.issued = 0
+        self.resumes = [synthetic_resume(seed, i) for i in range(size)]
+
+    def next(self, rng: random.Random) -> bytes:
+        if self.size:
+            return rng.choice(self.resumes)
+        self.issued += 1
+        return synthetic_resume(self.seed, self.issued)
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip().strip("/")
+        if name not in ENDPOINTS:
+            raise ValueError(f"unknown endpoint in --mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+async def send(client: httpx.AsyncClient, endpoint: str, pool: ResumePool, rng: random.Random, rank_batch: int) -> Sample:
+    data = {"job_description": JOB_DESCRIPTION}
+    if endpoint == "rank-resumes":
+        files = [
+            ("resumes", (f"resume_{i}.pdf", pool.next(rng), "application/pdf"))
+            for i in range(rank_batch)
+        ]
+    else:
+        files = [("resume", ("resume.pdf", pool.next(rng), "application/pdf"))]
+        if endpoint == "extract-name":
+            data = {}
+
+    started = time.perf_counter()
+    try:
+        response = await client.post(f"/{endpoint}", files=files, data=data)
+        return Sample(endpoint, time.perf_counter() - started, response.status_code)
+    except httpx.HTTPError as e:
+        return Sample(endpoint, time.perf_counter() - started, 0, type(e).__name__)
+
+async def recruiter(client, deadline: float, budget: List[int], weights: Dict[str, float], pool, rng, rank_batch, samples):
+    endpoints, endpoint_weights = list(weights), list(weights.values())
+    while time.perf_counter() < deadline:
+        if budget[0] == 0:
+            return
+        budget[0] -= 1
+        endpoint = rng.choices(endpoints, weights=endpoint_weights)[0]
+        samples.append(await send(client, endpoint, pool, rng, rank_batch))
+
+async def probe(client: httpx.AsyncClient, interval: float, stop: asyncio.Event, latencies: List[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            await client.get(PROBE_PATH)
+            latencies.append(time.perf_counter() - started)
+        except httpx.HTTPError:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {}
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 1),
+        "p95_ms": round(float(p95), 1),
+        "p99_ms": round(float(p99), 1),
+        "max_ms": round(max(latencies) * 1000, 1),
+    }
+
+def summarize(samples: List[Sample], elapsed: float) -> dict:
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        key = sample.error or str(sample.status)
+        statuses[key] = statuses.get(key, 0) + 1
+    ok = sum(sample.ok for sample in samples)
+    return {
+        "requests": len(samples),
+        "ok": ok,
+        "error_rate": round(1 - ok / len(samples), 4) if samples else 0.0,
+        "throughput_per_s": round(ok / elapsed, 2) if elapsed else 0.0,
+        "statuses": statuses,
+        **latency_summary([sample.latency for sample in samples]),
+    }
+
+async def run_load(args, weights: Dict[str, float]) -> dict:
+    rng = random.Random(args.seed)
+    pool = ResumePool(args.pool, args.seed)
+    samples: List[Sample] = []
+    probe_latencies: List[float] = []
+    budget = [args.requests if args.requests else -1]
+    limits = httpx.Limits(max_connections=args.concurrency + 1, max_keepalive_connections=args.concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=args.app_url, timeout=args.timeout, limits=limits) as client:
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, args.probe_interval, stop, probe_latencies))
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            recruiter(client, deadline, budget, weights, pool, random.Random(rng.random()), args.rank_batch, samples)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "overall": summarize(samples, elapsed),
+        "endpoints": {
+            endpoint: summarize([sample for sample in samples if sample.endpoint == endpoint], elapsed)
+            for endpoint in weights
+        },
+        "event_loop_probe": {"samples": len(probe_latencies), **latency_summary(probe_latencies)},
+    }
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with status {process.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.25)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+@contextmanager
+def spawned_servers(args) -> Iterator[None]:
+    """Run the mock Gemini server and the app as subprocesses for the duration of the block."""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_dir = tempfile.mkdtemp(prefix="ragcruit-load-")
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    env = {
+        **os.environ,
+        "GEMINI_BASE_URL": mock_url,
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "load-test"),
+        "JOBS_DB_PATH": os.path.join(data_dir, "jobs.db"),
+        "INDEX_DIR": os.path.join(data_dir, "candidate_index"),
+        "RESUME_REGISTRY_DB_PATH": os.path.join(data_dir, "resume_registry.db"),
+        "SKILL_VECTOR_DB_PATH": os.path.join(data_dir, "skill_vectors.db"),
+        "PROFILE_DIR": os.path.join(data_dir, "profiles"),
+    }
+    mock_command = [sys.executable, "-m", "benchmarks.mock_gemini", "--port", str(args.mock_port)]
+    for option in FAULT_OPTIONS:
+        mock_command += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+    app_command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--port", str(args.app_port), "--log-level", "warning", "--no-access-log"
+    ]
+
+    processes = []
+    try:
+        processes.append(subprocess.Popen(mock_command, cwd=backend_dir, env=env))
+        wait_until_ready(f"{mock_url}/stats", processes[-1])
+        # The app's per-request JSON logs go to a file rather than the report
+        log = open(os.path.join(data_dir, "app.log"), "w")
+        processes.append(subprocess.Popen(app_command, cwd=backend_dir, env=env, stdout=log, stderr=subprocess.STDOUT))
+        wait_until_ready(f"{args.app_url}{PROBE_PATH}", processes[-1])
+        print(f"mock Gemini at {mock_url}, app at {args.app_url}, app log {log.name}")
+        yield
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+def print_report(results: dict, mock_stats: Optional[dict]) -> None:
+    print(f"\n{'endpoint':<16} {'requests':>8} {'ok/s':>8} {'errors':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = [*results["endpoints"].items(), ("overall", results["overall"])]
+    for name, summary in rows:
+        if not summary["requests"]:
+            continue
+        print(
+            f"{name:<16} {summary['requests']:>8} {summary['throughput_per_s']:>8.2f} "
+            f"{summary['error_rate']:>8.1%} {summary['p50_ms']:>9.1f} {summary['p95_ms']:>9.1f} {summary['p99_ms']:>9.1f}"
+        )
+    print(f"status codes: {results['overall']['statuses']}")
+    probe = results["event_loop_probe"]
+    if probe["samples"]:
+        print(
+            f"event-loop probe ({PROBE_PATH}): p50 {probe['p50_ms']} ms, p99 {probe['p99_ms']} ms, "
+            f"max {probe['max_ms']} ms over {probe['samples']} samples"
+        )
+    if mock_stats:
+        print(f"mock Gemini calls: {mock_stats}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app-url", default=None, help="app under test (default: http://127.0.0.1:<app-port>)")
+    parser.add_argument("--spawn", action="store_true", help="start the mock server and the app here")
+    parser.add_argument("--app-port", type=int, default=8000)
+    parser.add_argument("--mock-port", type=int, default=8001)
+    parser.add_argument("--concurrency", type=int, default=8, help="simultaneous recruiters")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many requests (0 = no cap)")
+    parser.add_argument("--mix", default="screen-resume=3,extract-name=5,rank-resumes=1",
+                        help="endpoint weights, e.g. screen-resume=3,extract-name=5,rank-resumes=1")
+    parser.add_argument("--rank-batch", type=int, default=10, help="resumes per /rank-resumes request")
+    parser.add_argument("--pool", type=int, default=50, help="distinct resumes to draw from (0 = all unique)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-request timeout in seconds")
+    parser.add_argument("--probe-interval", type=float, default=0.1, help="seconds between event-loop probes")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/loadtest-<sha>.json)")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    args.app_url = args.app_url or f"http://127.0.0.1:{args.app_port}"
+
+    try:
+        weights = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    mock_stats = None
+    if args.spawn:
+        with spawned_servers(args):
+            results = asyncio.run(run_load(args, weights))
+            mock_stats = httpx.get(f"http://127.0.0.1:{args.mock_port}/stats").json()
+    else:
+        results = asyncio.run(run_load(args, weights))
+
+    print_report(results, mock_stats)
+    config = {
+        "spawned": args.spawn,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "requests": args.requests,
+        "mix": weights,
+        "rank_batch": args.rank_batch,
+        "pool": args.pool,
+        # Fault settings only describe the mock when it was spawned here
+        "faults": {option: getattr(args, option) for option in FAULT_OPTIONS} if args.spawn else None,
+    }
+    output = write_report(config, {**results, "mock_gemini": mock_stats}, args.output, prefix="loadtest-")
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
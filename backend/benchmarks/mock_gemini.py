@@ -0,0 +1,181 @@
+"""Local mock of the Gemini REST API with latency and fault injection.
+
+Serves the endpoints the app's clients call (generateContent,
+streamGenerateContent, embedContent, batchEmbedContents) with the
+deterministic answers from benchmarks.fakes. Point the app at it with
+GEMINI_BASE_URL=http://127.0.0.1:<port>.
+
+Faults:
+    --latency-ms / --embed-latency-ms / --jitter-ms   response delay
+    --rate-limit-rate   fraction of calls answered 429 RESOURCE_EXHAUSTED
+    --error-rate        fraction of calls answered 500 INTERNAL
+    --rpm               requests-per-minute quota; calls beyond it get 429
+
+GET /stats returns per-method counts of calls, successes, 429s and 500s;
+POST /stats/reset clears them.
+
+Usage (from backend/):
+    python -m benchmarks.mock_gemini --port 8001 --latency-ms 400 --rate-limit-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from benchmarks.fakes import fake_embedding, fake_reply
+
+class FaultInjector:
+    """Decides the delay and outcome of every mock call from a seeded RNG."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        embed_latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        rpm: int = 0,
+        seed: int = 0
+    ):
+        self.latency_ms = latency_ms
+        self.embed_latency_ms = embed_latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.rpm = rpm
+        self.rng = random.Random(seed)
+        self.window: Deque[float] = deque()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def delay(self, method: str) -> float:
+        base = self.embed_latency_ms if "mbed" in method else self.latency_ms
+        return (base + self.jitter_ms * self.rng.random()) / 1000
+
+    def outcome(self, method: str) -> Optional[JSONResponse]:
+        """The injected error response for this call, or None to answer normally."""
+        counts = self.stats.setdefault(method, {"calls": 0, "ok": 0, "rate_limited": 0, "errors": 0})
+        counts["calls"] += 1
+
+        now = time.monotonic()
+        while self.window and now - self.window[0] > 60:
+            self.window.popleft()
+        over_quota = self.rpm > 0 and len(self.window) >= self.rpm
+        if not over_quota:
+            self.window.append(now)
+
+        draw = self.rng.random()
+        if over_quota or draw < self.rate_limit_rate:
+            counts["rate_limited"] += 1
+            return _error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota).")
+        if draw < self.rate_limit_rate + self.error_rate:
+            counts["errors"] += 1
+            return _error(500, "INTERNAL", "An internal error has occurred.")
+        counts["ok"] += 1
+        return None
+
+def _error(code: int, status: str, message: str) -> JSONResponse:
+    return JSONResponse({"error": {"code": code, "message": message, "status": status}}, status_code=code)
+
+def _prompt(body: dict) -> str:
+    return "\n".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+def _candidate(text: str, model: str, prompt: str, finish: bool = True) -> dict:
+    response = {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": text}]},
+            "index": 0,
+        }],
+        "usageMetadata": {
+            "promptTokenCount": len(prompt) // 4,
+            "candidatesTokenCount": len(text) // 4,
+            "totalTokenCount": (len(prompt) + len(text)) // 4,
+        },
+        "modelVersion": model,
+    }
+    if finish:
+        response["candidates"][0]["finishReason"] = "STOP"
+    return response
+
+def _content_text(content: dict) -> str:
+    return " ".join(part.get("text", "") for part in content.get("parts", []))
+
+def create_app(faults: FaultInjector) -> FastAPI:
+    app = FastAPI(title="Mock Gemini API")
+
+    @app.get("/stats")
+    async def stats():
+        return faults.stats
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        faults.stats.clear()
+        return {"status": "reset"}
+
+    @app.post("/{api_version}/models/{target}")
+    async def call_model(api_version: str, target: str, request: Request):
+        model, _, method = target.partition(":")
+        body = await request.json()
+        await asyncio.sleep(faults.delay(method))
+        error = faults.outcome(method)
+        if error is not None:
+            return error
+
+        if method == "generateContent":
+            prompt = _prompt(body)
+            return _candidate(fake_reply(prompt), model, prompt)
+        if method == "streamGenerateContent":
+            prompt = _prompt(body)
+            words = fake_reply(prompt).split(" ")
+
+            async def events():
+                for i, word in enumerate(words):
+                    last = i == len(words) - 1
+                    chunk = _candidate(word if last else word + " ", model, prompt, finish=last)
+                    yield f"data: {json.dumps(chunk)}\r\n\r\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+        if method == "embedContent":
+            return {"embedding": {"values": fake_embedding(_content_text(body.get("content", {})))}}
+        if method == "batchEmbedContents":
+            return {"embeddings": [
+                {"values": fake_embedding(_content_text(item.get("content", {})))}
+                for item in body.get("requests", [])
+            ]}
+        return _error(404, "NOT_FOUND", f"Method {method} is not supported by the mock.")
+
+    return app
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Fault options, shared with benchmarks.loadtest which forwards them."""
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="generateContent delay")
+    parser.add_argument("--embed-latency-ms", type=float, default=50.0, help="embedding call delay")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="uniform extra delay")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of calls answered 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered 500")
+    parser.add_argument("--rpm", type=int, default=0, help="requests-per-minute quota (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0)
+
+FAULT_OPTIONS: List[str] = [
+    "latency_ms", "embed_latency_ms", "jitter_ms", "rate_limit_rate", "error_rate", "rpm", "seed"
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    faults = FaultInjector(**{option: getattr(args, option) for option in FAULT_OPTIONS})
+    uvicorn.run(create_app(faults), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
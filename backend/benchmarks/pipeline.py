@@ -0,0 +1,206 @@
+"""Offline throughput of the screening pipeline at increasing batch sizes.
+
+Gemini is replaced by the deterministic fakes in benchmarks.fakes (with
+configurable latency) and resumes come from the synthetic corpus in
+benchmarks.corpus, so no network access or API key is needed. For every
+batch size N three stages are measured, each on a fresh corpus so the
+content caches start cold:
+
+    pdf_parse      extract_text_from_pdf over N resumes
+    graph          the compiled screening graph (with feedback), N states at
+                   RANK_CONCURRENCY, JD analysed up front as /screen-resume does
+    rank_endpoint  one POST /rank-resumes with N uploads, in process
+
+Each result carries the per-stage and per-node totals from the Prometheus
+histograms and the number of LLM calls. Results are written as JSON keyed
+by the git commit (benchmarks/results/<sha>.json), for benchmarks.compare.
+
+Usage (from backend/):
+    python -m benchmarks.pipeline --sizes 1,10,100,1000 --llm-latency-ms 400 --embed-latency-ms 80
+"""
+import os
+import tempfile
+
+# Keep every on-disk store out of backend/data; set before the app reads its settings
+_DATA_DIR = tempfile.mkdtemp(prefix="ragcruit-bench-")
+for _name, _file in [
+    ("JOBS_DB_PATH", "jobs.db"),
+    ("INDEX_DIR", "candidate_index"),
+    ("RESUME_REGISTRY_DB_PATH", "resume_registry.db"),
+    ("SKILL_VECTOR_DB_PATH", "skill_vectors.db"),
+    ("PROFILE_DIR", "profiles"),
+]:
+    os.environ.setdefault(_name, os.path.join(_DATA_DIR, _file))
+os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+from fastapi.testclient import TestClient
+from benchmarks.corpus import JOB_DESCRIPTION, synthetic_corpus
+from benchmarks.fakes import install_fakes
+from benchmarks.reporting import write_report
+from app.agents.job_profile import build_job_profile
+from app.core.config import settings
+from app.core.state import AgentState
+from app.services.pdf_service import extract_text_from_pdf, load_resume_document
+from app.utils.metrics import LLM_CALLS, NODE_DURATION, STAGE_DURATION
+import main as app_main
+
+STAGES = ("pdf_parse", "graph", "rank_endpoint")
+
+def histogram_totals(histogram) -> Dict[str, Tuple[float, float]]:
+    """label -> (count, sum seconds) for a single-label histogram."""
+    totals: Dict[str, List[float]] = {}
+    for metric in histogram.collect():
+        for sample in metric.samples:
+            label = next(iter(sample.labels.values()), "")
+            if sample.name.endswith("_count"):
+                totals.setdefault(label, [0.0, 0.0])[0] = sample.value
+            elif sample.name.endswith("_sum"):
+                totals.setdefault(label, [0.0, 0.0])[1] = sample.value
+    return {label: (count, total) for label, (count, total) in totals.items()}
+
+def llm_call_total() -> float:
+    return sum(
+        sample.value
+        for metric in LLM_CALLS.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_total")
+    )
+
+def breakdown(before: Dict[str, Tuple[float, float]], after: Dict[str, Tuple[float, float]]) -> Dict[str, dict]:
+    """Calls and total ms per label between two histogram snapshots."""
+    result = {}
+    for label, (count, total) in after.items():
+        prior_count, prior_total = before.get(label, (0.0, 0.0))
+        if count > prior_count:
+            result[label] = {
+                "count": int(count - prior_count),
+                "total_ms": round((total - prior_total) * 1000, 2)
+            }
+    return result
+
+def measure(run: Callable[[], None], n: int) -> dict:
+    """Time one run and attribute its stage, node and LLM activity."""
+    stages, nodes, llm_calls = histogram_totals(STAGE_DURATION), histogram_totals(NODE_DURATION), llm_call_total()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    return {
+        "wall_s": round(elapsed, 4),
+        "throughput_per_s": round(n / elapsed, 2),
+        "ms_per_item": round(elapsed * 1000 / n, 3),
+        "llm_calls": int(llm_call_total() - llm_calls),
+        "stages": breakdown(stages, histogram_totals(STAGE_DURATION)),
+        "nodes": breakdown(nodes, histogram_totals(NODE_DURATION)),
+    }
+
+def pdf_parse_run(pdfs: List[bytes], job_description: str, client: TestClient) -> Callable[[], None]:
+    def run():
+        for pdf in pdfs:
+            extract_text_from_pdf(pdf)
+    return run
+
+def graph_run(pdfs: List[bytes], job_description: str, client: TestClient) -> Callable[[], None]:
+    # Parsing and the JD analysis are setup here; only the graph is timed
+    documents = [load_resume_document(pdf) for pdf in pdfs]
+    profile = build_job_profile(job_description)
+    states = [app_main.build_agent_state(document, profile) for document in documents]
+
+    async def invoke_all():
+        semaphore = asyncio.Semaphore(settings.RANK_CONCURRENCY)
+
+        async def invoke(state: AgentState):
+            async with semaphore:
+                return await app_main.agent.ainvoke(state)
+
+        await asyncio.gather(*(invoke(state) for state in states))
+
+    return lambda: asyncio.run(invoke_all())
+
+def rank_endpoint_run(pdfs: List[bytes], job_description: str, client: TestClient) -> Callable[[], None]:
+    files = [("resumes", (f"resume_{i}.pdf", pdf, "application/pdf")) for i, pdf in enumerate(pdfs)]
+
+    def run():
+        response = client.post("/rank-resumes", files=files, data={"job_description": job_description})
+        response.raise_for_status()
+    return run
+
+RUNNERS = {
+    "pdf_parse": pdf_parse_run,
+    "graph": graph_run,
+    "rank_endpoint": rank_endpoint_run,
+}
+
+def run_benchmarks(stages: List[str], sizes: List[int], repeat: int, client: TestClient) -> List[dict]:
+    results = []
+    seed = 0
+    for stage in stages:
+        for n in sizes:
+            runs = []
+            for _ in range(repeat):
+                # A new seed (and JD variant) per run keeps every cache cold
+                seed += 1
+                pdfs = list(synthetic_corpus(n, seed=seed))
+                job_description = f"{JOB_DESCRIPTION} Requisition {seed}."
+                runs.append(measure(RUNNERS[stage](pdfs, job_description, client), n))
+            # Report the median run by wall time
+            median = sorted(runs, key=lambda run: run["wall_s"])[len(runs) // 2]
+            result = {"stage": stage, "n": n, **median}
+            if repeat > 1:
+                result["wall_s_runs"] = [run["wall_s"] for run in runs]
+                result["wall_s_stdev"] = round(statistics.stdev(result["wall_s_runs"]), 4)
+            results.append(result)
+            print(
+                f"{stage:<14} N={n:<5} {result['wall_s']:>9.3f}s "
+                f"{result['throughput_per_s']:>10.1f}/s {result['ms_per_item']:>10.2f} ms/item "
+                f"{result['llm_calls']:>6} LLM calls"
+            )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,10,100,1000", help="comma-separated batch sizes")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset of " + ", ".join(STAGES))
+    parser.add_argument("--repeat", type=int, default=1, help="runs per (stage, N); the median is reported")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra latency, derived from the input's hash")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<sha>.json)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    # Per-request JSON logs would dominate the output
+    logging.disable(logging.INFO)
+    install_fakes(args.llm_latency_ms, args.embed_latency_ms, args.jitter_ms)
+
+    with TestClient(app_main.app) as client:
+        # Warm up imports, graph compilation and the taxonomy matcher
+        for stage in stages:
+            RUNNERS[stage](list(synthetic_corpus(1, seed=-1)), JOB_DESCRIPTION, client)()
+        results = run_benchmarks(stages, sizes, max(1, args.repeat), client)
+
+    config = {
+        "llm_latency_ms": args.llm_latency_ms,
+        "embed_latency_ms": args.embed_latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "repeat": max(1, args.repeat),
+        "rank_concurrency": settings.RANK_CONCURRENCY,
+        "rank_prefilter_top_k": settings.RANK_PREFILTER_TOP_K,
+        "skill_local_min_matches": settings.SKILL_LOCAL_MIN_MATCHES,
+        "embedding_batch_size": settings.EMBEDDING_BATCH_SIZE,
+    }
+    output = write_report(config, results, args.output)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Shared helpers for writing benchmark and load-test results."""
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def git_revision() -> Dict[str, object]:
+    """Commit the results belong to (sha, subject, whether tracked files are modified)."""
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    try:
+        return {
+            "sha": git("rev-parse", "HEAD"),
+            "subject": git("log", "-1", "--format=%s"),
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        }
+    except (OSError, subprocess.CalledProcessError):
+        return {"sha": "unknown", "subject": "", "dirty": True}
+
+def write_report(config: dict, results: Any, output: Optional[str] = None, prefix: str = "") -> str:
+    """Write results with their commit, environment and configuration; returns the path.
+
+    The default path is benchmarks/results/<prefix><sha>[-dirty].json.
+    """
+    revision = git_revision()
+    report = {
+        "git": revision,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": config,
+        "results": results,
+    }
+    if not output:
+        suffix = "-dirty" if revision["dirty"] else ""
+        output = os.path.join(RESULTS_DIR, f"{prefix}{revision['sha'][:12]}{suffix}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    return output
@@ -0,0 +1,146 @@
+"""Per-candidate memory and graph overhead of AgentState, before and after.
+
+Compares the legacy state (embeddings as List[float], full-state copies via
+__add__, AgentState(**result) after every invoke) with the current compact
+state (shared float32 arrays, excluded from dumps, model_construct on the
+result). Both run through a graph with the same topology as the screening
+agent whose nodes do no real work, so only state handling is measured.
+
+Usage (from backend/):
+    python -m benchmarks.state_overhead --candidates 200 --dim 768 --requirements 12
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import warnings
+from typing import Any, Dict, List, Optional
+import numpy as np
+from pydantic import BaseModel
+from langgraph.graph import StateGraph, END
+from app.core.state import AgentState
+
+class LegacyAgentState(BaseModel):
+    """AgentState as it was before embeddings moved to numpy."""
+    resume_hash: str = ""
+    resume_text: str = ""
+    job_description: str = ""
+    extracted_skills: List[str] = []
+    required_skills: List[str] = []
+    missing_skills: List[str] = []
+    similarity_score: float = 0.0
+    similarity_scored: bool = False
+    relevant_chunks: List[str] = []
+    feedback_report: str = ""
+    trust_score: float = 0.0
+    jd_embedding: Optional[List[float]] = None
+    requirement_embeddings: Optional[List[List[float]]] = None
+
+    def __add__(self, other: Dict[str, Any]) -> "LegacyAgentState":
+        with warnings.catch_warnings():
+            # .dict() is deprecated in pydantic 2, but it is what the legacy state used
+            warnings.simplefilter("ignore", DeprecationWarning)
+            state_dict = self.dict()
+        for key, value in other.items():
+            if key in state_dict:
+                state_dict[key] = value
+        return LegacyAgentState(**state_dict)
+
+def build_graph(state_class, legacy: bool):
+    def extract_text(state):
+        # The legacy pass-through node returned the whole state
+        return state if legacy else {}
+
+    def extract_skills(state):
+        return {"extracted_skills": ["Python", "SQL", "Docker"]}
+
+    def process_jd(state):
+        return {}
+
+    def calculate_similarity(state):
+        return {"similarity_score": 0.8, "relevant_chunks": ["chunk"] * 4}
+
+    def find_missing_skills(state):
+        if legacy:
+            state = state + {"missing_skills": ["Kubernetes"]}
+        return {"missing_skills": ["Kubernetes"]}
+
+    def calculate_trust_score(state):
+        return {"trust_score": 75.0}
+
+    workflow = StateGraph(state_class)
+    for name, node in [
+        ("extract_text", extract_text), ("extract_skills", extract_skills), ("process_jd", process_jd),
+        ("calculate_similarity", calculate_similarity), ("find_missing_skills", find_missing_skills),
+        ("calculate_trust_score", calculate_trust_score),
+    ]:
+        workflow.add_node(name, node)
+    workflow.set_entry_point("extract_text")
+    branches = ["extract_skills", "process_jd", "calculate_similarity"]
+    for branch in branches:
+        workflow.add_edge("extract_text", branch)
+    workflow.add_edge(branches, "find_missing_skills")
+    workflow.add_edge("find_missing_skills", "calculate_trust_score")
+    workflow.add_edge("calculate_trust_score", END)
+    return workflow.compile()
+
+def make_state(legacy: bool, jd_embedding: np.ndarray, requirement_embeddings: np.ndarray, i: int):
+    fields = dict(
+        resume_hash=f"{i:064x}",
+        resume_text="Experienced engineer. " * 200,
+        job_description="We need Python, SQL and Kubernetes. " * 20,
+        required_skills=["Python", "SQL", "Kubernetes", "Docker"],
+        similarity_scored=True,
+    )
+    if legacy:
+        # Callers passed the cached JSON lists, which every state validated and copied
+        return LegacyAgentState(
+            **fields,
+            jd_embedding=jd_embedding.tolist(),
+            requirement_embeddings=requirement_embeddings.tolist()
+        )
+    return AgentState(**fields, jd_embedding=jd_embedding, requirement_embeddings=requirement_embeddings)
+
+async def run(legacy: bool, candidates: int, dim: int, requirements: int) -> Dict[str, float]:
+    rng = np.random.default_rng(0)
+    jd_embedding = rng.standard_normal(dim).astype(np.float32)
+    requirement_embeddings = rng.standard_normal((requirements, dim)).astype(np.float32)
+    state_class = LegacyAgentState if legacy else AgentState
+    graph = build_graph(state_class, legacy)
+
+    # Warm up graph compilation caches
+    await graph.ainvoke(make_state(legacy, jd_embedding, requirement_embeddings, -1))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = []
+    for i in range(candidates):
+        result = await graph.ainvoke(make_state(legacy, jd_embedding, requirement_embeddings, i))
+        results.append(state_class(**result) if legacy else state_class.model_construct(**result))
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ms_per_candidate": round(elapsed * 1000 / candidates, 3),
+        "retained_kib_per_candidate": round(retained / 1024 / candidates, 1),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--requirements", type=int, default=12)
+    args = parser.parse_args()
+
+    print(f"{args.candidates} candidates, {args.dim}-d embeddings, {args.requirements} requirements")
+    print(f"{'state':<8} {'ms/candidate':>14} {'retained KiB/candidate':>24} {'peak KiB':>12}")
+    for label, legacy in [("legacy", True), ("compact", False)]:
+        stats = asyncio.run(run(legacy, args.candidates, args.dim, args.requirements))
+        print(
+            f"{label:<8} {stats['ms_per_candidate']:>14} "
+            f"{stats['retained_kib_per_candidate']:>24} {stats['peak_kib']:>12}"
+        )
+
+if __name__ == "__main__":
+    main()
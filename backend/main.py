@@ -1,35 +1,66 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-from app.services.pdf_service import extract_text_from_pdf, is_valid_pdf
-from app.agents.resume_agent import create_resume_agent
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager, nullcontext
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional, Dict, Any, Tuple
+from app.services.pdf_service import (
+    ResumeDocument, get_registered_document, get_registered_name, load_resume_document,
+    register_resume_document
+)
+from app.services.cache_service import candidate_cache, job_cache, resume_cache
+from app.agents.resume_agent import create_resume_agent, generate_feedback, stream_feedback
+from app.agents.resume_profile import analyze_resume, extract_name_with_regex, get_candidate_name
+from app.agents.skill_matcher import normalize_skill, skill_match_matrix
+from app.agents.trust_score import trust_score_matrix
+from app.agents.skill_taxonomy import match_skills
+from app.agents.job_profile import JobProfile, build_job_profile, get_jd_embedding
+from app.agents.retrieval import embed_resume_chunks, score_candidates, similarity_matrix
+from app.services.embedding_service import embedding_service
+from app.services.candidate_index import candidate_index
+from app.services.job_queue import JobQueue
+from app.services.archive_service import iter_archive_pdfs
+from app.services.lexical_ranker import bm25_scores, top_k_indices
+from app.services.chunking import skill_context
+from app.services.ranking_store import PROCESSING_ERROR, order_ranking, rescore_ranking, store_ranking
 from app.core.state import AgentState
 from app.models.schemas import ScreeningResult
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 from app.core.config import settings
+from app.utils.logger import new_request_context, request_context, request_logger, summarize_timings
+from app.utils.metrics import REQUEST_DURATION, in_flight
+from app.utils.profiling import PROFILED_ROUTES, ProfileSession, profiling_requested, track_request
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+import numpy as np
 import uvicorn
+import asyncio
 import logging
 import traceback
 import uuid
-import re
 import json
+import time
 import os
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Resume Screener API")
-agent = create_resume_agent()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the candidate pool and run the job workers for the app's lifetime"""
+    try:
+        await run_in_threadpool(candidate_index.load)
+    except Exception as e:
+        logger.error(f"Candidate index load error: {str(e)}")
+    await job_queue.start()
+    try:
+        yield
+    finally:
+        await job_queue.stop()
 
-# Initialize LLM for name extraction
-llm = ChatGoogleGenerativeAI(
-    model=settings.LLM_MODEL,
-    temperature=0.0,
-    google_api_key=settings.GOOGLE_API_KEY
-)
+app = FastAPI(title="AI Resume Screener API", lifespan=lifespan)
+agent = create_resume_agent()
+# Ranking mode: stops at calculate_trust_score, feedback is generated on demand
+ranking_agent = create_resume_agent(include_feedback=False)
 
 # Pydantic model for ranked candidates
 class RankedCandidate(BaseModel):
@@ -39,210 +70,960 @@ class RankedCandidate(BaseModel):
     similarity_score: float
     missing_skills: List[str]
     extracted_skills: List[str]
+    years_experience: Optional[float] = None
+    # Set when the BM25 prefilter ran; prefiltered candidates skipped the full pipeline
+    lexical_score: Optional[float] = None
+    prefiltered: bool = False
+    # Only set by rescoring with must-have skills
+    meets_must_haves: Optional[bool] = None
+
+# Pydantic model for rescoring a stored ranking
+class RescoreRequest(BaseModel):
+    similarity_weight: float = Field(settings.TRUST_SIMILARITY_WEIGHT, ge=0.0, le=1.0)
+    # Required skill -> weight in the coverage term (unlisted skills weigh 1.0)
+    skill_weights: Dict[str, Annotated[float, Field(ge=0.0)]] = {}
+    must_have_skills: List[str] = []
+
+# Pydantic model for the resume registry
+class RegisteredResume(BaseModel):
+    resume_id: str
+    filename: str
+    name: str
+    page_count: int
+
+# Pydantic models for multi-JD matrix ranking
+class RoleMatch(BaseModel):
+    resume_id: str
+    name: str
+    trust_score: float
+    similarity_score: float
+    missing_skills: List[str]
+
+class RoleRanking(BaseModel):
+    job_index: int
+    required_skills: List[str]
+    ranking: List[RoleMatch]
+
+class MatrixCandidate(BaseModel):
+    resume_id: str
+    filename: str
+    name: str
+    extracted_skills: List[str]
+    years_experience: Optional[float] = None
+    # Index of the job description this candidate fits best
+    best_role: int
+    best_trust_score: float
+
+class MatrixRanking(BaseModel):
+    candidates: List[MatrixCandidate]
+    roles: List[RoleRanking]
+    # candidates x job descriptions, in request order
+    similarity_matrix: List[List[float]]
+    trust_matrix: List[List[float]]
+
+# Pydantic models for the persistent candidate index
+class IndexedCandidate(BaseModel):
+    content_hash: str
+    name: str
+    filename: str
+
+class PoolMatch(IndexedCandidate):
+    similarity_score: float
+
+# Pydantic model for batch ranking jobs
+class RankingJob(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    processed: int
+    created_at: float
+    updated_at: float
+    results: List[RankedCandidate]
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    """Request metrics and one structured log line per request.
+
+    Stage and node timings recorded while the request is served are
+    summarised into the log line. For streaming endpoints the duration is
+    the time until the response starts. Profiled routes opted in with
+    X-Profile / ?profile=1 are captured with cProfile and saved to
+    PROFILE_DIR; the id comes back in X-Profile-Id. The event loop part is
+    skipped when other requests are in flight (see ProfileSession).
+    """
+    request_id = request.headers.get("X-Request-Id") or str(uuid.uuid4())
+    context = new_request_context(request_id, request.scope)
+    session = None
+    if request.url.path in PROFILED_ROUTES and profiling_requested(request.headers, request.query_params):
+        session = ProfileSession()
+        context["profile"] = session
+    token = request_context.set(context)
+    status = 500
+    try:
+        with track_request() as requests_in_flight:
+            if session is None:
+                response = await call_next(request)
+            else:
+                with session.capture_event_loop(requests_in_flight):
+                    response = await call_next(request)
+        if session is not None:
+            try:
+                await run_in_threadpool(session.save, settings.PROFILE_DIR, {
+                    "request_id": request_id,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status": response.status_code,
+                    "duration_ms": round((time.perf_counter() - context["started"]) * 1000, 2),
+                }, context)
+                response.headers["X-Profile-Id"] = session.profile_id
+            except Exception as e:
+                # A profile that cannot be written must not fail the request
+                logger.error(f"Profile save error: {str(e)}")
+        status = response.status_code
+        response.headers["X-Request-Id"] = request_id
+        return response
+    finally:
+        elapsed = time.perf_counter() - context["started"]
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        REQUEST_DURATION.labels(request.method, route, str(status)).observe(elapsed)
+        request_logger.info("request", extra={"fields": {
+            "method": request.method,
+            "route": route,
+            "status": status,
+            "duration_ms": round(elapsed * 1000, 2),
+            "stages": summarize_timings(context),
+        }})
+        request_context.reset(token)
+
+def build_agent_state(
+    document: ResumeDocument,
+    profile: JobProfile,
+    retrieval: Optional[Tuple[float, List[str]]] = None
+) -> AgentState:
+    """Seed the per-resume graph state with the precomputed JD analysis.
+
+    Batch callers that already retrieved and scored the resume's chunks pass
+    `retrieval` as (similarity_score, relevant_chunks), so the graph skips
+    that step.
+    """
+    state = AgentState(
+        resume_hash=document.content_hash,
+        resume_text=document.text,
+        job_description=profile.job_description,
+        required_skills=profile.required_skills,
+        jd_embedding=profile.jd_embedding,
+        requirement_embeddings=profile.requirement_embeddings
+    )
+    if retrieval is not None:
+        state.similarity_score, state.relevant_chunks = retrieval
+        state.similarity_scored = True
+    return state
+
+def load_registered_resumes(resume_ids: List[str]) -> List[Tuple[str, ResumeDocument]]:
+    """(filename, document) for each registered resume id; 404 if any is unknown"""
+    found = [get_registered_document(resume_id) for resume_id in resume_ids]
+    unknown = [resume_id for resume_id, entry in zip(resume_ids, found) if entry is None]
+    if unknown:
+        raise HTTPException(404, f"Unknown resume ids: {', '.join(unknown)}")
+    return found
+
+async def prepare_screening(
+    resume: Optional[UploadFile],
+    job_description: str,
+    resume_id: Optional[str] = None
+) -> AgentState:
+    """Parse the upload (or load the registered resume) and seed the graph state for a single screening"""
+    if resume_id:
+        _, document = (await run_in_threadpool(load_registered_resumes, [resume_id]))[0]
+    elif resume is not None:
+        # Validate and parse PDF file once
+        document = await run_in_threadpool(load_resume_document, await resume.read())
+        if document is None:
+            raise HTTPException(400, "Invalid or empty PDF file")
+    else:
+        raise HTTPException(400, "Upload a resume or pass a resume_id")
+    
+    # Check if text extraction was successful
+    if not document.text.strip():
+        raise HTTPException(400, "Could not extract text from PDF")
+    
+    # Analyse the job description (cached by JD hash)
+    profile = await run_in_threadpool(build_job_profile, job_description)
+    
+    # Initialize agent state
+    return build_agent_state(document, profile)
+
+def screening_scores(result_model: AgentState) -> Dict[str, Any]:
+    return {
+        "trust_score": result_model.trust_score,
+        "similarity_score": round(result_model.similarity_score, 4),
+        "extracted_skills": result_model.extracted_skills,
+        "required_skills": result_model.required_skills,
+        "missing_skills": result_model.missing_skills
+    }
 
 @app.post("/screen-resume", response_model=ScreeningResult)
 async def screen_resume(
-    resume: UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: str = Form(...),
+    resume: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None)
 ):
     try:
-        # Validate PDF file
-        if not is_valid_pdf(await resume.read()):
-            raise HTTPException(400, "Invalid or empty PDF file")
-        await resume.seek(0)  # Reset file pointer
-        
-        # Process resume PDF
-        resume_bytes = await resume.read()
-        resume_text = extract_text_from_pdf(resume_bytes)
-        
-        # Check if text extraction was successful
-        if not resume_text.strip():
-            raise HTTPException(400, "Could not extract text from PDF")
-        
-        # Initialize agent state
-        state = AgentState(
-            resume_text=resume_text,
-            job_description=job_description
-        )
+        state = await prepare_screening(resume, job_description, resume_id)
         
         # Execute agent workflow
-        result = agent.invoke(state)
+        with in_flight():
+            result = await agent.ainvoke(state)
         
-        # Convert to Pydantic model for proper serialization
-        result_model = AgentState(**result)
+        # Wrap the graph output without re-validating it
+        result_model = AgentState.model_construct(**result)
         
-        return {
-            "trust_score": result_model.trust_score,
-            "similarity_score": round(result_model.similarity_score, 4),
-            "extracted_skills": result_model.extracted_skills,
-            "required_skills": result_model.required_skills,
-            "missing_skills": result_model.missing_skills,
-            "feedback": result_model.feedback_report
-        }
+        return {**screening_scores(result_model), "feedback": result_model.feedback_report}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Processing error: {str(e)}")
         logger.error(traceback.format_exc())
         raise HTTPException(500, f"Processing error: {str(e)}")
 
-def extract_name_with_regex(text: str) -> str:
-    """Try to extract name using regex patterns"""
-    patterns = [
-        r"^(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]*)+)",  # First Last at start
-        r"\b(?:[A-Z][a-z]+ [A-Z]\. [A-Z][a-z]+)\b",  # First M. Last
-        r"Name:\s*(.+)",
-        r"Contact\s*Info\s*\n(.+)",
-        r"Resume\s*of\s*(.+)",
-        r"([A-Z][a-z]+ [A-Z][a-z]+)\s*\n\s*[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",  # Name followed by email
-    ]
+@app.post("/screen-resume/stream")
+async def screen_resume_stream(
+    job_description: str = Form(...),
+    resume: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None)
+):
+    """Screen a resume, streaming NDJSON: scores first, then feedback tokens.
+
+    Emits {"type": "scores", "result": {...}}, then one
+    {"type": "feedback", "text": ...} line per LLM chunk, then {"type": "done"}.
+    """
+    try:
+        state = await prepare_screening(resume, job_description, resume_id)
+        
+        # Score without feedback; the report is streamed afterwards
+        with in_flight():
+            result = await ranking_agent.ainvoke(state)
+        result_model = AgentState.model_construct(**result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Processing error: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(500, f"Processing error: {str(e)}")
     
-    for pattern in patterns:
-        match = re.search(pattern, text, re.MULTILINE | re.IGNORECASE)
-        if match:
-            name = match.group(1).strip() if match.lastindex else match.group(0).strip()
-            # Clean up the name
-            name = re.sub(r"^(Resume|CV|Name|of|[:])", "", name, flags=re.IGNORECASE).strip()
-            return name
+    async def stream():
+        yield json.dumps({"type": "scores", "result": screening_scores(result_model)}) + "\n"
+        try:
+            async for token in stream_feedback(result_model):
+                yield json.dumps({"type": "feedback", "text": token}) + "\n"
+            yield json.dumps({"type": "done"}) + "\n"
+        except Exception as e:
+            logger.error(f"Feedback stream error: {str(e)}")
+            logger.error(traceback.format_exc())
+            yield json.dumps({"type": "error", "detail": f"Feedback error: {str(e)}"}) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+async def extract_candidate_name(document: ResumeDocument) -> str:
+    """Extract the candidate name from an already parsed resume"""
+    # Check if text extraction was successful
+    if not document.text.strip():
+        return "No Text Found"
     
-    return ""
+    return await get_candidate_name(document)
 
 @app.post("/extract-name")
 async def extract_name(resume: UploadFile = File(...)):
     try:
-        # Validate PDF file
-        if not is_valid_pdf(await resume.read()):
+        # Validate and parse PDF file once
+        document = await run_in_threadpool(load_resume_document, await resume.read())
+        if document is None:
             return {"name": "Invalid PDF"}
-        await resume.seek(0)  # Reset file pointer
-        
-        # Extract text from PDF
-        resume_bytes = await resume.read()
-        resume_text = extract_text_from_pdf(resume_bytes)
-        
-        # Check if text extraction was successful
-        if not resume_text.strip():
-            return {"name": "No Text Found"}
-        
-        # First try regex extraction
-        candidate_name = extract_name_with_regex(resume_text)
-        if candidate_name:
-            return {"name": candidate_name}
-        
-        # If regex fails, use LLM with a better prompt
-        prompt = ChatPromptTemplate.from_template(
-            "Extract the candidate's full name from the resume text below. "
-            "The name is usually at the top of the resume. "
-            "Return ONLY the full name in JSON format: {{\"name\": \"John Doe\"}}. "
-            "If you cannot find a name, return {{\"name\": \"Unknown Candidate\"}}.\n\n"
-            "Resume Text:\n{text}"
-        )
         
-        chain = prompt | llm | StrOutputParser()
-        response = chain.invoke({"text": resume_text[:10000]})  # Use first 10k characters
-        
-        try:
-            # Try to parse JSON response
-            name_data = json.loads(response)
-            return name_data
-        except json.JSONDecodeError:
-            # If JSON parsing fails, try to extract name from text
-            name_match = re.search(r'[\'"]?name[\'"]?\s*:\s*[\'"](.+?)[\'"]', response)
-            if name_match:
-                return {"name": name_match.group(1).strip()}
-            
-            # Return the first proper name structure found in the response
-            name_match = re.search(r'([A-Z][a-z]+ [A-Z][a-z]+)', response)
-            if name_match:
-                return {"name": name_match.group(0)}
-            
-            return {"name": "Unknown Candidate"}
+        return {"name": await extract_candidate_name(document)}
         
     except Exception as e:
         logger.error(f"Name extraction error: {str(e)}")
         return {"name": "Unknown Candidate"}
 
-@app.post("/rank-resumes", response_model=List[RankedCandidate])
-async def rank_resumes(
-    job_description: str = Form(...),
-    resumes: List[UploadFile] = File(...)
-):
-    try:
-        if not resumes:
-            raise HTTPException(400, "No resumes uploaded")
-            
-        results = []
-        names = []
-        valid_resumes = []
-        
-        # Validate all resumes first
-        for resume in resumes:
+async def rank_candidate(
+    filename: str,
+    document: ResumeDocument,
+    profile: JobProfile,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    retrieval: Optional[Tuple[float, List[str]]] = None,
+    lexical_score: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """Score a single candidate. Failures are isolated into an error row.
+
+    `semaphore` caps concurrency across a request's candidates; callers
+    that bound concurrency themselves (the job workers) pass None.
+    """
+    async with semaphore or nullcontext():
+        with in_flight():
+            # Name, skills and experience come from one (cached) structured call
             try:
-                # Check if PDF is valid
-                if not is_valid_pdf(await resume.read()):
-                    logger.warning(f"Invalid PDF: {resume.filename}")
-                    continue
-                await resume.seek(0)  # Reset file pointer
-                valid_resumes.append(resume)
+                resume_profile = await analyze_resume(document) if document.text.strip() else None
             except Exception as e:
-                logger.error(f"Error validating resume {resume.filename}: {str(e)}")
-        
-        if not valid_resumes:
-            raise HTTPException(400, "No valid PDF files uploaded")
+                logger.error(f"Resume analysis error: {str(e)}")
+                resume_profile = None
+            name = resume_profile.name if resume_profile else "Unknown Candidate"
         
-        # First pass: Extract names
-        for resume in valid_resumes:
-            name_response = await extract_name(resume)
-            names.append(name_response["name"])
-            await resume.seek(0)  # Reset file pointer after name extraction
-        
-        # Second pass: Process resumes
-        for i, resume in enumerate(valid_resumes):
             try:
-                # Process resume
-                resume_bytes = await resume.read()
-                resume_text = extract_text_from_pdf(resume_bytes)
-                
+                resume_text = document.text
+            
                 # Check if text extraction was successful
                 if not resume_text.strip():
-                    logger.warning(f"Empty text from: {resume.filename}")
-                    continue
-                
+                    logger.warning(f"Empty text from: {filename}")
+                    return None
+            
                 # Create unique ID for candidate
                 candidate_id = str(uuid.uuid4())
-                
+            
                 # Run screening
-                state = AgentState(
-                    resume_text=resume_text,
-                    job_description=job_description
-                )
-                result = agent.invoke(state)
-                result_model = AgentState(**result)
-                
-                results.append({
+                state = build_agent_state(document, profile, retrieval)
+                if resume_profile is not None:
+                    state.extracted_skills = resume_profile.skills
+                result = await ranking_agent.ainvoke(state)
+                result_model = AgentState.model_construct(**result)
+            
+                # Keep what the feedback endpoint needs for this candidate
+                candidate_cache.set(candidate_id, "state", {
+                    "resume_hash": result_model.resume_hash,
+                    "resume_text": result_model.resume_text,
+                    "job_description": result_model.job_description,
+                    "extracted_skills": result_model.extracted_skills,
+                    "required_skills": result_model.required_skills,
+                    "missing_skills": result_model.missing_skills,
+                    "similarity_score": result_model.similarity_score,
+                    "relevant_chunks": result_model.relevant_chunks,
+                    "trust_score": result_model.trust_score
+                })
+            
+                return {
                     "candidate_id": candidate_id,
-                    "name": names[i],
+                    "name": name,
                     "trust_score": result_model.trust_score,
                     "similarity_score": round(result_model.similarity_score, 4),
                     "missing_skills": result_model.missing_skills,
-                    "extracted_skills": result_model.extracted_skills
-                })
+                    "extracted_skills": result_model.extracted_skills,
+                    "years_experience": resume_profile.years_experience if resume_profile else None,
+                    "lexical_score": lexical_score
+                }
             except Exception as e:
-                logger.error(f"Error processing resume {resume.filename}: {str(e)}")
-                results.append({
+                logger.error(f"Error processing resume {filename}: {str(e)}")
+                return {
                     "candidate_id": str(uuid.uuid4()),
-                    "name": names[i],
+                    "name": name,
                     "trust_score": 0.0,
                     "similarity_score": 0.0,
-                    "missing_skills": ["Processing Error"],
-                    "extracted_skills": ["Processing Error"]
-                })
+                    "missing_skills": [PROCESSING_ERROR],
+                    "extracted_skills": [PROCESSING_ERROR],
+                    "lexical_score": lexical_score
+                }
+
+def prefiltered_candidate(document: ResumeDocument, profile: JobProfile, lexical_score: float) -> Dict[str, Any]:
+    """Row for a candidate cut by the lexical prefilter, built without any model calls"""
+    skills = resume_cache.get(document.content_hash, "skills")
+    if skills is None:
+        skills = match_skills(skill_context(document.text))
+    found = {normalize_skill(skill) for skill in skills}
+    return {
+        "candidate_id": str(uuid.uuid4()),
+        "name": extract_name_with_regex(document.text) or "Unknown Candidate",
+        "trust_score": 0.0,
+        "similarity_score": 0.0,
+        "missing_skills": [skill for skill in profile.required_skills if normalize_skill(skill) not in found],
+        "extracted_skills": skills,
+        "lexical_score": lexical_score,
+        "prefiltered": True
+    }
+
+def lexical_prefilter(
+    documents: List[ResumeDocument],
+    job_description: str,
+    profile: JobProfile,
+    top_k: int
+) -> Tuple[List[int], List[float], List[Dict[str, Any]]]:
+    """BM25 first stage: (kept indices, their lexical scores, rows of the cut resumes).
+
+    Runs in a worker thread; scoring and the skill matching for the cut rows
+    both scale with the batch.
+    """
+    scores = bm25_scores([document.text for document in documents], job_description)
+    keep = top_k_indices(scores, top_k)
+    kept = set(keep)
+    prefiltered = [
+        prefiltered_candidate(document, profile, round(float(scores[i]), 4))
+        for i, document in enumerate(documents)
+        if i not in kept
+    ]
+    return keep, [round(float(scores[i]), 4) for i in keep], prefiltered
+
+async def load_ranking_resumes(
+    resumes: Optional[List[UploadFile]],
+    resume_ids: Optional[List[str]]
+) -> List[Tuple[str, ResumeDocument]]:
+    """(filename, document) for every valid upload, followed by the registered resumes"""
+    resumes = resumes or []
+    resume_ids = resume_ids or []
+    if not resumes and not resume_ids:
+        raise HTTPException(400, "No resumes uploaded")
+        
+    valid_resumes = []
+    
+    # Validate and parse all resumes first (each PDF is parsed exactly once)
+    for resume in resumes:
+        try:
+            document = await run_in_threadpool(load_resume_document, await resume.read())
+            if document is None:
+                logger.warning(f"Invalid PDF: {resume.filename}")
+                continue
+            valid_resumes.append((resume.filename, document))
+        except Exception as e:
+            logger.error(f"Error validating resume {resume.filename}: {str(e)}")
+    valid_resumes.extend(await run_in_threadpool(load_registered_resumes, resume_ids))
+    
+    if not valid_resumes:
+        raise HTTPException(400, "No valid PDF files uploaded")
+    return valid_resumes
+
+async def prepare_ranking(
+    job_description: str,
+    resumes: Optional[List[UploadFile]],
+    resume_ids: Optional[List[str]] = None
+) -> Tuple[JobProfile, list, List[Dict[str, Any]]]:
+    """Parse the uploads, analyse the JD and batch-score resume retrieval.
+
+    Registered resumes referenced by `resume_ids` are loaded from the
+    registry without re-parsing and ranked after the uploads.
+
+    When RANK_PREFILTER_TOP_K is set and the batch is larger, resumes are first
+    ranked by BM25 against the JD and only the top K continue. Returns the
+    job profile, one (filename, document, retrieval, lexical_score) tuple
+    per remaining resume in upload order, and the rows of prefiltered
+    resumes.
+    """
+    valid_resumes = await load_ranking_resumes(resumes, resume_ids)
+    
+    # Analyse the job description once for the whole batch
+    profile = await run_in_threadpool(build_job_profile, job_description)
+    
+    # Cheap lexical first stage: only the top-K resumes reach the embedding and LLM steps
+    lexical_scores = [None] * len(valid_resumes)
+    prefiltered = []
+    top_k = settings.RANK_PREFILTER_TOP_K
+    if 0 < top_k < len(valid_resumes):
+        keep, lexical_scores, prefiltered = await run_in_threadpool(
+            lexical_prefilter, [document for _, document in valid_resumes], job_description, profile, top_k
+        )
+        valid_resumes = [valid_resumes[i] for i in keep]
+        logger.info(f"Lexical prefilter kept {len(keep)} of {len(keep) + len(prefiltered)} resumes")
+    
+    # Chunk and embed uncached resumes in batched calls, then score every
+    # candidate's chunks against the JD requirements in one pass
+    retrievals = [None] * len(valid_resumes)
+    try:
+        chunk_sets = await run_in_threadpool(
+            embed_resume_chunks,
+            [(document.content_hash, document.text) for _, document in valid_resumes]
+        )
+        scores = score_candidates([embeddings for _, embeddings in chunk_sets], profile.queries)
+        retrievals = [
+            (similarity, [chunks[j] for j in best_chunks])
+            for (chunks, _), (similarity, best_chunks) in zip(chunk_sets, scores)
+        ]
+    except Exception as e:
+        # Fall back to retrieval inside each candidate's graph
+        logger.error(f"Batch retrieval error: {str(e)}")
+    
+    candidates = [
+        (filename, document, retrievals[i], lexical_scores[i])
+        for i, (filename, document) in enumerate(valid_resumes)
+    ]
+    return profile, candidates, prefiltered
+
+def rank_candidates(profile: JobProfile, candidates) -> list:
+    """One rank_candidate coroutine per candidate, sharing a concurrency cap"""
+    semaphore = asyncio.Semaphore(settings.RANK_CONCURRENCY)
+    return [
+        rank_candidate(filename, document, profile, semaphore, retrieval, lexical_score)
+        for filename, document, retrieval, lexical_score in candidates
+    ]
+
+@app.post("/rank-resumes", response_model=List[RankedCandidate])
+async def rank_resumes(
+    response: Response,
+    job_description: str = Form(...),
+    resumes: Optional[List[UploadFile]] = File(None),
+    resume_ids: Optional[List[str]] = Form(None)
+):
+    try:
+        profile, candidates, prefiltered = await prepare_ranking(job_description, resumes, resume_ids)
+        
+        # Process candidates concurrently, at most RANK_CONCURRENCY at a time
+        rows = await asyncio.gather(*rank_candidates(profile, candidates))
+        results = [row for row in rows if row is not None]
         
-        # Sort by trust_score descending
-        results.sort(key=lambda x: x["trust_score"], reverse=True)
-        return results
+        # Sort by trust_score descending, prefiltered candidates last
+        ranking = order_ranking(results + prefiltered)
         
+        # Keep the features so the ranking can be rescored without the pipeline
+        response.headers["X-Ranking-Id"] = store_ranking(profile.required_skills, ranking)
+        return ranking
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Ranking error: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(500, f"Ranking error: {str(e)}")
+
+@app.post("/rank-resumes/stream")
+async def rank_resumes_stream(
+    job_description: str = Form(...),
+    resumes: Optional[List[UploadFile]] = File(None),
+    resume_ids: Optional[List[str]] = Form(None)
+):
+    """Stream ranked candidates as NDJSON as soon as each one is scored.
+
+    Emits one {"type": "candidate", "candidate": {...}} line per candidate
+    and a final {"type": "done", "ranking": [candidate_id, ...],
+    "ranking_id": ..., "required_skills": [...], "similarity_weight": ...}
+    line with the ids ordered by trust score, the id to rescore the ranking
+    with and the similarity weight it was scored with. Prefiltered candidates are emitted first,
+    since they need no further work.
+    """
+    try:
+        profile, candidates, prefiltered = await prepare_ranking(job_description, resumes, resume_ids)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Ranking error: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(500, f"Ranking error: {str(e)}")
+    
+    async def numbered(position: int, task):
+        return position, await task
+    
+    async def stream():
+        results = []
+        tasks = []
+        try:
+            for row in prefiltered:
+                yield json.dumps({"type": "candidate", "candidate": row}) + "\n"
+            
+            tasks = [
+                asyncio.create_task(numbered(i, task))
+                for i, task in enumerate(rank_candidates(profile, candidates))
+            ]
+            for next_row in asyncio.as_completed(tasks):
+                position, row = await next_row
+                if row is None:
+                    continue
+                results.append((position, row))
+                yield json.dumps({"type": "candidate", "candidate": row}) + "\n"
+            
+            # Same ordering as /rank-resumes: upload order, then stable sort by trust_score
+            results = [row for _, row in sorted(results, key=lambda x: x[0])]
+            results = order_ranking(results + prefiltered)
+            yield json.dumps({
+                "type": "done",
+                "ranking": [row["candidate_id"] for row in results],
+                "ranking_id": store_ranking(profile.required_skills, results),
+                "required_skills": profile.required_skills,
+                "similarity_weight": settings.TRUST_SIMILARITY_WEIGHT
+            }) + "\n"
+        except Exception as e:
+            logger.error(f"Ranking stream error: {str(e)}")
+            logger.error(traceback.format_exc())
+            yield json.dumps({"type": "error", "detail": f"Ranking error: {str(e)}"}) + "\n"
+        finally:
+            # Stop scoring if the client went away
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/rankings/{ranking_id}/rescore", response_model=List[RankedCandidate])
+async def rescore(ranking_id: str, request: RescoreRequest):
+    """Re-rank a stored ranking under new weights or must-have skills, without any model calls"""
+    try:
+        ranking = rescore_ranking(
+            ranking_id, request.similarity_weight, request.skill_weights, request.must_have_skills
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    if ranking is None:
+        raise HTTPException(404, "Ranking not found")
+    return ranking
+
+@app.post("/rank-matrix", response_model=MatrixRanking)
+async def rank_matrix(
+    job_descriptions: List[str] = Form(...),
+    resumes: Optional[List[UploadFile]] = File(None),
+    resume_ids: Optional[List[str]] = Form(None)
+):
+    """Rank N resumes against M job descriptions in one request.
+
+    Each JD and each resume is analysed once; the N x M similarity and
+    trust matrices are computed with matrix products instead of M separate
+    rankings. Returns per-JD rankings and each candidate's best-fit role.
+    """
+    try:
+        job_descriptions = [jd for jd in job_descriptions if jd.strip()]
+        if not job_descriptions:
+            raise HTTPException(400, "No job descriptions given")
+        valid_resumes = await load_ranking_resumes(resumes, resume_ids)
+        documents = [document for _, document in valid_resumes]
+        
+        # Analyse every JD and every resume exactly once
+        profiles = await asyncio.gather(*[
+            run_in_threadpool(build_job_profile, job_description) for job_description in job_descriptions
+        ])
+        semaphore = asyncio.Semaphore(settings.RANK_CONCURRENCY)
+        
+        async def analyze(document: ResumeDocument):
+            async with semaphore:
+                try:
+                    return await analyze_resume(document) if document.text.strip() else None
+                except Exception as e:
+                    logger.error(f"Resume analysis error: {str(e)}")
+                    return None
+        
+        resume_profiles = await asyncio.gather(*[analyze(document) for document in documents])
+        skills = [resume_profile.skills if resume_profile else [] for resume_profile in resume_profiles]
+        chunk_sets = await run_in_threadpool(
+            embed_resume_chunks, [(document.content_hash, document.text) for document in documents]
+        )
+        
+        # candidates x JDs similarity, and required skills x candidates coverage
+        similarity = await run_in_threadpool(
+            similarity_matrix, [embeddings for _, embeddings in chunk_sets], [profile.queries for profile in profiles]
+        )
+        required = list(dict.fromkeys(skill for profile in profiles for skill in profile.required_skills))
+        covered = await run_in_threadpool(skill_match_matrix, required, skills)
+        
+        # JDs x required skills membership, averaged into per-JD coverage
+        row = {skill: i for i, skill in enumerate(required)}
+        membership = np.zeros((len(profiles), len(required)), dtype=np.float32)
+        for j, profile in enumerate(profiles):
+            for skill in profile.required_skills:
+                membership[j, row[skill]] = 1.0
+        counts = membership.sum(axis=1, keepdims=True)
+        coverage = (np.divide(membership, counts, out=np.zeros_like(membership), where=counts > 0) @ covered).T
+        trust = trust_score_matrix(similarity, coverage)
+        
+        names = [resume_profile.name if resume_profile else "Unknown Candidate" for resume_profile in resume_profiles]
+        candidates = [
+            {
+                "resume_id": document.content_hash,
+                "filename": filename,
+                "name": names[i],
+                "extracted_skills": skills[i],
+                "years_experience": resume_profiles[i].years_experience if resume_profiles[i] else None,
+                "best_role": int(trust[i].argmax()),
+                "best_trust_score": float(trust[i].max())
+            }
+            for i, (filename, document) in enumerate(valid_resumes)
+        ]
+        roles = []
+        for j, profile in enumerate(profiles):
+            required_rows = [row[skill] for skill in dict.fromkeys(profile.required_skills)]
+            ranking = [
+                {
+                    "resume_id": documents[i].content_hash,
+                    "name": names[i],
+                    "trust_score": float(trust[i, j]),
+                    "similarity_score": round(float(similarity[i, j]), 4),
+                    "missing_skills": [required[r] for r in required_rows if not covered[r, i]]
+                }
+                for i in np.argsort(-trust[:, j], kind="stable")
+            ]
+            roles.append({"job_index": j, "required_skills": profile.required_skills, "ranking": ranking})
+        
+        return {
+            "candidates": candidates,
+            "roles": roles,
+            "similarity_matrix": np.round(similarity.astype(np.float64), 4).tolist(),
+            "trust_matrix": trust.tolist()
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Matrix ranking error: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(500, f"Matrix ranking error: {str(e)}")
+
+@app.post("/resumes", response_model=RegisteredResume)
+async def register_resume(resume: UploadFile = File(...)):
+    """Store and pre-process a resume; its id (content hash) can be ranked and screened later"""
+    document = await run_in_threadpool(load_resume_document, await resume.read())
+    if document is None or not document.text.strip():
+        raise HTTPException(400, "Invalid or empty PDF file")
+    
+    name = "Unknown Candidate"
+    try:
+        name = await extract_candidate_name(document)
+    except Exception as e:
+        logger.error(f"Name extraction error: {str(e)}")
+    await run_in_threadpool(register_resume_document, document, resume.filename, name)
+    
+    # Warm the chunk caches; the full profile is built when the resume is first ranked
+    try:
+        await run_in_threadpool(embed_resume_chunks, [(document.content_hash, document.text)])
+    except Exception as e:
+        logger.error(f"Resume pre-processing error: {str(e)}")
+    
+    return {
+        "resume_id": document.content_hash,
+        "filename": resume.filename,
+        "name": name,
+        "page_count": document.page_count
+    }
+
+@app.get("/resumes/{resume_id}", response_model=RegisteredResume)
+async def get_registered_resume(resume_id: str):
+    registered = await run_in_threadpool(get_registered_document, resume_id)
+    if registered is None:
+        raise HTTPException(404, "Resume not found")
+    filename, document = registered
+    return {
+        "resume_id": resume_id,
+        "filename": filename,
+        "name": await run_in_threadpool(get_registered_name, resume_id),
+        "page_count": document.page_count
+    }
+
+async def rank_pdf(
+    filename: str,
+    pdf_bytes: bytes,
+    profile: JobProfile,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> Optional[Dict[str, Any]]:
+    """Parse and score one resume PDF; None when the PDF is unusable"""
+    document = await run_in_threadpool(load_resume_document, pdf_bytes)
+    if document is None:
+        logger.warning(f"Invalid PDF: {filename}")
+        return None
+    return await rank_candidate(filename, document, profile, semaphore)
+
+@app.post("/rank-resumes/archive")
+async def rank_resume_archive(
+    job_description: str = Form(...),
+    archive: UploadFile = File(...)
+):
+    """Rank every PDF in one ZIP or TAR archive, streaming NDJSON.
+
+    The upload is spooled to disk by the server; members are unpacked one
+    at a time and handed to RANK_CONCURRENCY workers through a bounded
+    queue, so memory stays flat however large the archive is. Messages are
+    the same as /rank-resumes/stream. The lexical prefilter and batch
+    retrieval need the whole batch up front and are not applied here.
+    """
+    try:
+        members = await run_in_threadpool(
+            iter_archive_pdfs, archive.file, settings.ARCHIVE_MAX_MEMBER_BYTES, settings.ARCHIVE_MAX_MEMBERS
+        )
+        profile = await run_in_threadpool(build_job_profile, job_description)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     except Exception as e:
         logger.error(f"Ranking error: {str(e)}")
         logger.error(traceback.format_exc())
         raise HTTPException(500, f"Ranking error: {str(e)}")
+    
+    worker_count = max(1, settings.RANK_CONCURRENCY)
+    semaphore = asyncio.Semaphore(worker_count)
+    # At most worker_count unpacked PDFs wait in memory at any time
+    pending: asyncio.Queue = asyncio.Queue(maxsize=worker_count)
+    rows: asyncio.Queue = asyncio.Queue()
+    
+    async def unpack():
+        try:
+            while True:
+                member = await run_in_threadpool(next, members, None)
+                if member is None:
+                    break
+                await pending.put(member)
+        except Exception as e:
+            logger.error(f"Archive read error: {str(e)}")
+            await rows.put({"error": f"Archive read error: {str(e)}"})
+        finally:
+            for _ in range(worker_count):
+                await pending.put(None)
+    
+    async def work():
+        while True:
+            member = await pending.get()
+            if member is None:
+                break
+            filename, pdf_bytes = member
+            try:
+                row = await rank_pdf(filename, pdf_bytes, profile, semaphore)
+            except Exception as e:
+                logger.error(f"Error processing resume {filename}: {str(e)}")
+                row = None
+            if row is not None:
+                await rows.put(row)
+        await rows.put(None)
+    
+    async def stream():
+        tasks = [asyncio.create_task(unpack())] + [asyncio.create_task(work()) for _ in range(worker_count)]
+        results = []
+        try:
+            finished = 0
+            while finished < worker_count:
+                row = await rows.get()
+                if row is None:
+                    finished += 1
+                elif "error" in row:
+                    yield json.dumps({"type": "error", "detail": row["error"]}) + "\n"
+                else:
+                    results.append(row)
+                    yield json.dumps({"type": "candidate", "candidate": row}) + "\n"
+            
+            results = order_ranking(results)
+            yield json.dumps({
+                "type": "done",
+                "ranking": [row["candidate_id"] for row in results],
+                "ranking_id": store_ranking(profile.required_skills, results),
+                "required_skills": profile.required_skills,
+                "similarity_weight": settings.TRUST_SIMILARITY_WEIGHT
+            }) + "\n"
+        finally:
+            # Stop unpacking if the client went away
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+async def process_job_candidate(job_description: str, filename: str, pdf_bytes: bytes) -> Optional[Dict[str, Any]]:
+    """Score one candidate of a batch job; None when the PDF is unusable"""
+    profile = await run_in_threadpool(build_job_profile, job_description)
+    # The JOB_WORKERS workers already bound the job's concurrency
+    return await rank_pdf(filename, pdf_bytes, profile)
+
+job_queue = JobQueue(settings.JOBS_DB_PATH, settings.JOB_WORKERS, process_job_candidate)
+
+@app.post("/jobs/rank", status_code=202)
+async def submit_ranking_job(
+    job_description: str = Form(...),
+    resumes: List[UploadFile] = File(...)
+):
+    """Queue a batch ranking job and return its id immediately"""
+    if not resumes:
+        raise HTTPException(400, "No resumes uploaded")
+    
+    files = [(resume.filename, await resume.read()) for resume in resumes]
+    job_id = await job_queue.submit(job_description, files)
+    return {"job_id": job_id, "status": "queued", "total": len(files)}
+
+@app.get("/jobs/{job_id}", response_model=RankingJob)
+async def get_ranking_job(job_id: str):
+    """Progress and (partial) results of a ranking job, best candidates first"""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    return job
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_ranking_job(job_id: str):
+    if not await job_queue.cancel(job_id):
+        raise HTTPException(409, "Job not found or already finished")
+    return {"job_id": job_id, "status": "cancelled"}
+
+@app.post("/candidates/{candidate_id}/feedback")
+async def candidate_feedback(candidate_id: str):
+    """Generate (once) and return the feedback report for a ranked candidate"""
+    feedback = candidate_cache.get(candidate_id, "feedback")
+    if feedback is not None:
+        return {"candidate_id": candidate_id, "feedback": feedback}
+    
+    stored = candidate_cache.get(candidate_id, "state")
+    if stored is None:
+        raise HTTPException(404, "Candidate not found")
+    
+    try:
+        feedback = await run_in_threadpool(generate_feedback, AgentState(**stored))
+        candidate_cache.set(candidate_id, "feedback", feedback)
+        return {"candidate_id": candidate_id, "feedback": feedback}
+    except Exception as e:
+        logger.error(f"Feedback error: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(500, f"Feedback error: {str(e)}")
+
+@app.post("/index/resumes", response_model=List[IndexedCandidate])
+async def index_resumes(resumes: List[UploadFile] = File(...)):
+    """Ingest resumes into the persistent candidate pool"""
+    try:
+        documents = []
+        filenames = []
+        for resume in resumes:
+            document = await run_in_threadpool(load_resume_document, await resume.read())
+            if document is None or not document.text.strip():
+                logger.warning(f"Skipping unreadable PDF: {resume.filename}")
+                continue
+            documents.append(document)
+            filenames.append(resume.filename)
+        
+        if not documents:
+            raise HTTPException(400, "No valid PDF files uploaded")
+        
+        names = await asyncio.gather(*[extract_candidate_name(document) for document in documents])
+        embeddings = await run_in_threadpool(embedding_service.embed_resumes, documents)
+        
+        indexed = []
+        for document, filename, name, embedding in zip(documents, filenames, names, embeddings):
+            metadata = {"name": name, "filename": filename}
+            await run_in_threadpool(candidate_index.add, document.content_hash, embedding, metadata)
+            indexed.append({"content_hash": document.content_hash, **metadata})
+        await run_in_threadpool(candidate_index.save)
+        return indexed
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Indexing error: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(500, f"Indexing error: {str(e)}")
+
+@app.delete("/index/resumes/{content_hash}")
+async def remove_indexed_resume(content_hash: str):
+    removed = await run_in_threadpool(candidate_index.remove, content_hash)
+    if not removed:
+        raise HTTPException(404, "Resume not found in index")
+    await run_in_threadpool(candidate_index.save)
+    return {"removed": content_hash}
+
+@app.post("/index/search", response_model=List[PoolMatch])
+async def search_candidate_pool(
+    job_description: str = Form(...),
+    top_k: int = Form(10, ge=1)
+):
+    """Return the top-k candidates in the pool for a job description"""
+    if len(candidate_index) == 0:
+        return []
+    try:
+        jd_embedding = await run_in_threadpool(get_jd_embedding, job_description)
+        return await run_in_threadpool(candidate_index.search, jd_embedding, top_k)
+    except Exception as e:
+        logger.error(f"Pool search error: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(500, f"Pool search error: {str(e)}")
+
+@app.get("/index/stats")
+async def index_stats():
+    return candidate_index.stats()
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus exposition of request, node, stage, LLM, cache and in-flight metrics"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {"resume": resume_cache.stats(), "job": job_cache.stats()}
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,52 @@
+import pytest
+from app.agents.skill_taxonomy import AhoCorasick, canonical_skill, match_skills
+
+def test_aho_corasick_finds_overlapping_patterns():
+    matcher = AhoCorasick({"he": "he", "she": "she", "hers": "hers"})
+    assert sorted(matcher.find_all("ushers")) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+@pytest.mark.parametrize("text, skills", [
+    ("HTML/CSS/JavaScript", ["HTML", "CSS", "JavaScript"]),
+    ("Java/Spring Boot", ["Java", "Spring Boot"]),
+    ("Docker-compose setups", ["Docker"]),
+    ("CI/CD with Jenkins/GitHub Actions", ["CI/CD", "Jenkins", "GitHub Actions"]),
+    ("PL/SQL, TCP/IP and T-SQL", ["SQL", "Networking"]),
+    ("Test-Driven Development with scikit-learn", ["Test-Driven Development", "scikit-learn"]),
+])
+def test_slash_and_hyphen_separate_skills(text, skills):
+    assert match_skills(text) == skills
+
+def test_leftmost_longest_match_wins():
+    assert match_skills("React Native and Python") == ["React Native", "Python"]
+
+def test_multi_skill_alias_reports_every_skill():
+    assert match_skills("AWS Lambda, S3") == ["Serverless", "AWS"]
+
+@pytest.mark.parametrize("text", [
+    "Built containerization tooling",
+    "Strong on algorithms",
+    "Worked on distributed systems",
+])
+def test_lossy_aliases_are_gone(text):
+    assert match_skills(text) == []
+
+def test_dotnet_maps_to_dotnet():
+    assert match_skills(".NET Core and dotnet tooling") == [".NET"]
+
+@pytest.mark.parametrize("text", [
+    "Go to the C. R. team meeting and excel at agile delivery",
+    "I react quickly, spark ideas and ride the rails with a java in hand",
+    "Consulted the oracle",
+])
+def test_common_words_in_prose_are_not_skills(text):
+    assert match_skills(text) == []
+
+def test_common_words_count_next_to_other_skills():
+    assert match_skills("Skills: Java, React, Spark, Python") == ["Java", "React", "Apache Spark", "Python"]
+    assert match_skills("Golang and Microsoft Excel") == ["Go", "Excel"]
+
+def test_canonical_skill_accepts_ambiguous_names_on_their_own():
+    assert canonical_skill("go") == "Go"
+    assert canonical_skill("react") == "React"
+    assert canonical_skill("AWS Lambda") == "Serverless"
+    assert canonical_skill("Unknown Thing ") == "Unknown Thing"
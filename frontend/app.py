@@ -1,6 +1,8 @@
 import streamlit as st
 import requests
+import hashlib
 import time
+import json
 import pandas as pd
 
 # Page configuration
@@ -87,6 +89,125 @@ def load_css():
 
 load_css()
 
+@st.cache_resource
+def get_session():
+    """One pooled HTTP session, so reruns reuse keep-alive connections"""
+    return requests.Session()
+
+def register_resumes(session, uploaded_files):
+    """Upload each file to the backend resume registry once; returns the resume ids.
+
+    Files are tracked by their SHA-256 in session state, so re-running a
+    ranking (for example after editing the JD) sends only ids.
+    """
+    registered = st.session_state.setdefault("registered_resumes", {})
+    resume_ids = []
+    for uploaded in uploaded_files:
+        content = uploaded.getvalue()
+        digest = hashlib.sha256(content).hexdigest()
+        if digest not in registered:
+            response = session.post(
+                "http://localhost:8000/resumes",
+                files={"resume": (uploaded.name, content, "application/pdf")},
+                timeout=(10, 120)
+            )
+            if response.status_code != 200:
+                st.warning(f"Skipped {uploaded.name}: {response.text}")
+            registered[digest] = response.json()["resume_id"] if response.status_code == 200 else None
+        if registered[digest]:
+            resume_ids.append(registered[digest])
+    return resume_ids
+
+def post_registered(session, endpoint, uploaded_files, data, single=False, timeout=(10, 120)):
+    """Stream a POST that references the uploads by registry id.
+
+    Returns None when none of the files is a valid resume. If the backend no
+    longer knows an id (404), the files are registered again and the request
+    retried once.
+    """
+    for attempt in range(2):
+        resume_ids = register_resumes(session, uploaded_files)
+        if not resume_ids:
+            return None
+        id_data = {"resume_id": resume_ids[0]} if single else {"resume_ids": resume_ids}
+        response = session.post(endpoint, data={**data, **id_data}, stream=True, timeout=timeout)
+        if response.status_code != 404 or attempt:
+            return response
+        st.session_state.registered_resumes = {}
+
+def ranking_dataframe(ranking_results):
+    """Build the ranking table from RankedCandidate dicts"""
+    data = []
+    for i, candidate in enumerate(ranking_results):
+        data.append({
+            "Candidate": candidate.get("name", f"Candidate {i+1}"),
+            "Trust Score": candidate["trust_score"],
+            "Similarity Score": candidate["similarity_score"] * 100,
+            "Prefiltered": candidate.get("prefiltered", False)
+        })
+    return pd.DataFrame(data)
+
+def format_ranking(df):
+    return df.style.format({
+        "Trust Score": "{:.1f}%",
+        "Similarity Score": "{:.1f}%"
+    })
+
+def render_screening_results(results):
+    """Render trust score, metrics and skills of a screening result"""
+    st.header("Screening Results")
+    
+    # Trust Score display
+    trust_score = results["trust_score"]
+    st.subheader(f"Trust Score: {trust_score}/100")
+    
+    # Score visualization
+    progress_color = "red" if trust_score < 50 else "orange" if trust_score < 75 else "green"
+    st.markdown(f"""
+    <div class="progress-container">
+        <div class="progress-bar" style="width: {trust_score}%; background-color: var(--{progress_color});">
+            <span class="progress-text">{trust_score}%</span>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Metrics
+    col21, col22 = st.columns(2)
+    with col21:
+        st.metric(
+            label="Similarity Score", 
+            value=f"{results['similarity_score']*100:.2f}%",
+            help="Semantic match between resume and job description"
+        )
+    with col22:
+        st.metric(
+            label="Missing Skills", 
+            value=len(results["missing_skills"]),
+            help="Required skills not found in resume"
+        )
+    
+    # Skills analysis
+    with st.expander("🔍 Skills Analysis", expanded=True):
+        tab1, tab2, tab3 = st.tabs(["Extracted", "Required", "Missing"])
+        
+        with tab1:
+            if results["extracted_skills"]:
+                st.write(results["extracted_skills"])
+            else:
+                st.info("No skills extracted")
+                
+        with tab2:
+            if results["required_skills"]:
+                st.write(results["required_skills"])
+            else:
+                st.info("No skills extracted from JD")
+                
+        with tab3:
+            if results["missing_skills"]:
+                st.write(results["missing_skills"])
+            else:
+                st.success("All required skills are present!")
+
 # Initialize session state
 if "results" not in st.session_state:
     st.session_state.results = None
@@ -166,6 +287,12 @@ with col1:
                 key="resumes_uploader",
                 help="Upload multiple candidate resumes"
             )
+            resume_archive = st.file_uploader(
+                "Or upload a ZIP/TAR archive of resumes",
+                type=["zip", "tar", "gz", "tgz"],
+                key="archive_uploader",
+                help="Large batches: PDFs in the archive are unpacked and ranked one by one on the server"
+            )
             ranking_jd_text = st.text_area(
                 "Paste Job Description",
                 height=300,
@@ -178,7 +305,7 @@ with col1:
             
             if ranking_submitted:
                 # Validate inputs
-                if not resume_files:
+                if not resume_files and resume_archive is None:
                     st.error("Please upload at least one resume")
                     st.stop()
                     
@@ -195,24 +322,50 @@ if st.session_state.form_submitted:
     with st.spinner("Processing candidate..."):
         start_time = time.time()
         try:
-            # Prepare request data
-            files = {"resume": ("resume.pdf", resume_file.getvalue(), "application/pdf")}
-            data = {"job_description": job_description_text}
-            
-            # Call backend API
-            response = requests.post(
-                "http://localhost:8000/screen-resume",
-                files=files,
-                data=data,
-                timeout=60
+            # Call streaming backend API: scores first, then feedback tokens.
+            # The PDF is uploaded to the registry once and then sent by id.
+            response = post_registered(
+                get_session(),
+                "http://localhost:8000/screen-resume/stream",
+                [resume_file],
+                {"job_description": job_description_text},
+                single=True,
+                timeout=(10, 60)  # connect timeout, max wait between messages
             )
             
-            if response.status_code == 200:
-                results = response.json()
-                processing_time = time.time() - start_time
-                st.session_state.results = results
-                st.session_state.ranking_results = None  # Clear previous ranking results
-                st.success(f"Analysis completed in {processing_time:.2f} seconds!")
+            if response is None:
+                st.error("Invalid or empty PDF file")
+            elif response.status_code == 200:
+                results = None
+                feedback = ""
+                with col2:
+                    live_view = st.empty()
+                
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    message = json.loads(line)
+                    
+                    if message["type"] == "scores":
+                        results = message["result"]
+                        with live_view.container():
+                            st.caption(f"Scored in {time.time() - start_time:.2f} seconds")
+                            render_screening_results(results)
+                            st.subheader("Improvement Suggestions")
+                            feedback_area = st.empty()
+                    elif message["type"] == "feedback" and results is not None:
+                        feedback += message["text"]
+                        feedback_area.markdown(feedback + "▌", unsafe_allow_html=True)
+                    elif message["type"] == "error":
+                        st.error(message["detail"])
+                
+                live_view.empty()
+                if results is not None:
+                    results["feedback"] = feedback
+                    processing_time = time.time() - start_time
+                    st.session_state.results = results
+                    st.session_state.ranking_results = None  # Clear previous ranking results
+                    st.success(f"Analysis completed in {processing_time:.2f} seconds!")
             else:
                 st.error(f"Backend error: {response.text}")
         except requests.exceptions.ConnectionError:
@@ -226,24 +379,64 @@ if st.session_state.form_submitted:
 
 # Candidate ranking processing
 if st.session_state.ranking_submitted:
-    with st.spinner(f"Processing {len(resume_files)} candidates. This may take a while..."):
+    batch_label = "the archived" if resume_archive is not None else len(resume_files)
+    with st.spinner(f"Processing {batch_label} candidates. This may take a while..."):
         start_time = time.time()
         try:
-            # Prepare request data
-            files = []
-            for i, resume in enumerate(resume_files):
-                files.append(("resumes", (f"resume_{i}.pdf", resume.getvalue(), "application/pdf")))
-            
-            # Call ranking API
-            response = requests.post(
-                "http://localhost:8000/rank-resumes",
-                files=files,
-                data={"job_description": ranking_jd_text},
-                timeout=len(resume_files) * 30  # 30 seconds per resume
-            )
+            # Call streaming ranking API; candidates arrive as soon as they are scored.
+            # Archives are uploaded as one part; PDFs go to the registry once and are sent by id.
+            if resume_archive is not None:
+                response = get_session().post(
+                    "http://localhost:8000/rank-resumes/archive",
+                    files={"archive": (resume_archive.name, resume_archive.getvalue(), "application/octet-stream")},
+                    data={"job_description": ranking_jd_text},
+                    stream=True,
+                    timeout=(10, 120)  # connect timeout, max wait between results
+                )
+            else:
+                response = post_registered(
+                    get_session(),
+                    "http://localhost:8000/rank-resumes/stream",
+                    resume_files,
+                    {"job_description": ranking_jd_text}
+                )
             
-            if response.status_code == 200:
-                ranking_results = response.json()
+            if response is None:
+                st.error("No valid PDF files uploaded")
+            elif response.status_code == 200:
+                ranking_results = []
+                with col2:
+                    live_header = st.empty()
+                    live_table = st.empty()
+                
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    message = json.loads(line)
+                    
+                    if message["type"] == "candidate":
+                        ranking_results.append(message["candidate"])
+                        ranking_results.sort(key=lambda c: c["trust_score"], reverse=True)
+                        live_header.markdown(
+                            f"### Candidate Ranking ({len(ranking_results)} scored, "
+                            f"{time.time() - start_time:.1f}s)"
+                        )
+                        live_table.dataframe(
+                            format_ranking(ranking_dataframe(ranking_results)),
+                            use_container_width=True,
+                            hide_index=True
+                        )
+                    elif message["type"] == "done":
+                        order = {candidate_id: i for i, candidate_id in enumerate(message["ranking"])}
+                        ranking_results.sort(key=lambda c: order.get(c["candidate_id"], len(order)))
+                        st.session_state.ranking_id = message.get("ranking_id")
+                        st.session_state.required_skills = message.get("required_skills", [])
+                        st.session_state.similarity_weight = message.get("similarity_weight", 0.5)
+                    elif message["type"] == "error":
+                        st.error(message["detail"])
+                
+                live_header.empty()
+                live_table.empty()
                 processing_time = time.time() - start_time
                 st.session_state.ranking_results = ranking_results
                 st.session_state.results = None  # Clear previous single result
@@ -265,58 +458,7 @@ with col2:
     if st.session_state.get("results"):
         results = st.session_state.results
         
-        st.header("Screening Results")
-        
-        # Trust Score display
-        trust_score = results["trust_score"]
-        st.subheader(f"Trust Score: {trust_score}/100")
-        
-        # Score visualization
-        progress_color = "red" if trust_score < 50 else "orange" if trust_score < 75 else "green"
-        st.markdown(f"""
-        <div class="progress-container">
-            <div class="progress-bar" style="width: {trust_score}%; background-color: var(--{progress_color});">
-                <span class="progress-text">{trust_score}%</span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Metrics
-        col21, col22 = st.columns(2)
-        with col21:
-            st.metric(
-                label="Similarity Score", 
-                value=f"{results['similarity_score']*100:.2f}%",
-                help="Semantic match between resume and job description"
-            )
-        with col22:
-            st.metric(
-                label="Missing Skills", 
-                value=len(results["missing_skills"]),
-                help="Required skills not found in resume"
-            )
-        
-        # Skills analysis
-        with st.expander("🔍 Skills Analysis", expanded=True):
-            tab1, tab2, tab3 = st.tabs(["Extracted", "Required", "Missing"])
-            
-            with tab1:
-                if results["extracted_skills"]:
-                    st.write(results["extracted_skills"])
-                else:
-                    st.info("No skills extracted")
-                    
-            with tab2:
-                if results["required_skills"]:
-                    st.write(results["required_skills"])
-                else:
-                    st.info("No skills extracted from JD")
-                    
-            with tab3:
-                if results["missing_skills"]:
-                    st.write(results["missing_skills"])
-                else:
-                    st.success("All required skills are present!")
+        render_screening_results(results)
         
         # Feedback report
         st.subheader("Improvement Suggestions")
@@ -329,23 +471,12 @@ with col2:
         st.header("Candidate Ranking Results")
         
         # Create dataframe for display
-        data = []
-        for i, candidate in enumerate(ranking_results):
-            data.append({
-                "Candidate": candidate.get("name", f"Candidate {i+1}"),
-                "Trust Score": candidate["trust_score"],
-                "Similarity Score": candidate["similarity_score"] * 100
-            })
-        
-        df = pd.DataFrame(data)
+        df = ranking_dataframe(ranking_results)
         
         # Display ranking table
         st.markdown("### Candidate Ranking")
         st.dataframe(
-            df.style.format({
-                "Trust Score": "{:.1f}%",
-                "Similarity Score": "{:.1f}%"
-            }),
+            format_ranking(df),
             use_container_width=True,
             height=min(400, 45 * len(df) + 45),
             hide_index=True
@@ -359,6 +490,30 @@ with col2:
             file_name='candidate_ranking.csv',
             mime='text/csv',
         )
+        
+        # Re-rank under different weights without re-running the pipeline
+        if st.session_state.get("ranking_id"):
+            with st.expander("Adjust Scoring"):
+                # Start from the weight the ranking was scored with, so an unchanged submit is a no-op
+                similarity_weight = st.slider(
+                    "Similarity weight", 0.0, 1.0, st.session_state.get("similarity_weight", 0.5), 0.05
+                )
+                must_have_skills = st.multiselect(
+                    "Must-have skills",
+                    st.session_state.get("required_skills", [])
+                )
+                if st.button("Rescore"):
+                    response = get_session().post(
+                        f"http://localhost:8000/rankings/{st.session_state.ranking_id}/rescore",
+                        json={"similarity_weight": similarity_weight, "must_have_skills": must_have_skills},
+                        timeout=(10, 30)
+                    )
+                    if response.status_code == 200:
+                        st.session_state.ranking_results = response.json()
+                        st.session_state.similarity_weight = similarity_weight
+                        st.rerun()
+                    else:
+                        st.error(f"Rescoring error: {response.text}")
 
 # Sidebar
 st.sidebar.title("About")